@@ -1,6 +1,6 @@
 from django.conf.urls import url
 
-from .views import OrganizationsApiView, TagsApiView
+from .views import MapApiView, OrganizationsApiView, TagsApiView
 
 
 urlpatterns = [
@@ -9,4 +9,5 @@ urlpatterns = [
         OrganizationsApiView.as_view(),
         name='organizations'),  # Filtered Topics
     url(r'^tags/$', TagsApiView.as_view(), name='tags_autocomplete'),
+    url(r'^map/(?P<ct>[\w\-]+)/$', MapApiView.as_view(), name='map'),
 ]
@@ -5,12 +5,13 @@ from logging import getLogger
 from django.conf import settings
 from django.core.cache import cache
 from django.views.generic import View
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import Http404, JsonResponse, HttpResponseBadRequest
 from django.template.defaultfilters import slugify
 from ratelimit.mixins import RatelimitMixin
 
-from ..metadata.models import Organization
-from ..content.models import ContentType
+from ..metadata.autocomplete import search_organizations
+from ..content.maps import get_map_data
+from ..content.models import CONTENT_TYPES, ContentType
 
 logger = getLogger(__name__)
 
@@ -64,7 +65,8 @@ class AutoCompleteView(BaseApiView):
 
 class OrganizationsApiView(AutoCompleteView):
     """
-    Returns a list of organizations matching a given `q` keyword.
+    Returns a list of organizations matching a given `q` keyword, best
+    matches first, see `metadata/autocomplete.py`.
     """
     cache = True
 
@@ -76,19 +78,21 @@ class OrganizationsApiView(AutoCompleteView):
         return 'api_organizations_{}'.format(slugify(self.q))
 
     def get_data(self):
-        data = Organization.objects.values('pk', 'org_name', 'state')
-        data = data.filter(org_name__icontains=self.q)
-        data = data.order_by('org_name')
-
-        data = list(data)
-        for x in data:
-            x['org_name'] = '{}, {}'.format(x['org_name'], x['state'])
-        return data
+        return [
+            {
+                'pk': pk,
+                'org_name': '{}, {}'.format(org_name, state),
+                'state': state,
+            }
+            for pk, org_name, state in search_organizations(
+                self.q, self.max_num_results)
+        ]
 
 
 class TagsApiView(AutoCompleteView):
     """
-    Returns a list of tags matching a given `q` keyword.
+    Returns a list of tags of published resources matching a given `q`
+    keyword, most used first.
     """
     cache = True
 
@@ -100,10 +104,35 @@ class TagsApiView(AutoCompleteView):
         return 'api_tags_{}'.format(slugify(self.q))
 
     def get_data(self):
-        # @todo: should we limit this to only tags on published contenttypes?
-        # I think this will be too heavy a query... :(
-        qs = ContentType.keywords.tag_model.objects.values(
-            'pk', 'name', 'slug').distinct('name')
-        qs = qs.filter(name__icontains=self.q)
-        qs = qs.exclude(count=0)
-        return list(qs)
+        qs = (ContentType.keywords.tag_model.objects
+              .filter(name__icontains=self.q,
+                      usage__published_count__gt=0)
+              .order_by('-usage__published_count', 'name')
+              .values('pk', 'name', 'slug'))
+        return list(qs[:self.max_num_results])
+
+
+class MapApiView(BaseApiView):
+    """
+    Returns the clustered organizations of a content type's published
+    resources as GeoJSON, for the `zoom` level and the optional `bbox`
+    (`west,south,east,north`) of the map, see `content/maps.py`.
+    """
+    def get(self, request, *args, **kwargs):
+        self.content_type = kwargs['ct']
+        if self.content_type not in CONTENT_TYPES:
+            raise Http404('Content type not found')
+        try:
+            self.zoom = int(request.GET.get('zoom', 1))
+            bbox = request.GET.get('bbox')
+            self.bounds = None
+            if bbox:
+                self.bounds = [float(value) for value in bbox.split(',')]
+                if len(self.bounds) != 4:
+                    raise ValueError(bbox)
+        except ValueError:
+            return HttpResponseBadRequest('Invalid zoom or bbox')
+        return super(MapApiView, self).get(request, *args, **kwargs)
+
+    def get_data(self):
+        return get_map_data(self.content_type, self.zoom, self.bounds)
@@ -0,0 +1,116 @@
+"""
+Generation based cache invalidation.
+
+Cached values that depend on published resources or on metadata are keyed
+with the current generation of their namespace(s). Bumping a generation
+retires every value keyed with it at once, without knowing the keys, so
+these values can be cached for days instead of expiring every few minutes.
+
+    - `content`: bumped by the content admin whenever the set of published
+      resources changes, see `BaseContentTypeAdmin`. Changes made in a
+      transaction bump their generations again once it commits, see
+      `invalidate_on_commit`.
+    - `metadata`: bumped whenever a topic, discipline etc. is saved or
+      deleted, see `MetadataConfig.ready`
+    - `search`: bumped whenever the search index is updated, see
+      `indexing.update_index`. Only keys the cached search hits (see
+      `hits.py`), so it isn't among the default `NAMESPACES`.
+    - `feeds`: bumped whenever the stored entries of a topic feed change,
+      see `metadata/feeds.py`. Only keys the topic pages and tabs listing
+      them, so it isn't among the default `NAMESPACES` either.
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+CONTENT = 'content'
+METADATA = 'metadata'
+SEARCH = 'search'
+FEEDS = 'feeds'
+NAMESPACES = (CONTENT, METADATA)
+
+GENERATION_KEY = 'cache_generation_{}'
+
+
+def _seed():
+    """
+    A missing counter (first use, eviction, `cache.clear()`) is seeded with
+    the current time in microseconds, so it never falls back to a generation
+    that was already used, however often the old counter was bumped.
+    """
+    return int(time.time() * 1000000)
+
+
+def get_generations(*namespaces):
+    """
+    The current generation of each of the given namespaces, in order.
+    """
+    namespaces = namespaces or NAMESPACES
+    keys = [GENERATION_KEY.format(ns) for ns in namespaces]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _seed(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def get_generation(namespace):
+    return get_generations(namespace)[0]
+
+
+def invalidate(*namespaces):
+    """
+    Bumps the generation of the given namespaces, retiring everything that
+    was cached for them.
+    """
+    for namespace in namespaces:
+        key = GENERATION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _seed(), None)
+
+
+def invalidate_on_commit(*namespaces):
+    """
+    Bumps the generation of the given namespaces right away, for the rest of
+    the current transaction, and once more when it is committed: until then,
+    other requests still read the old rows and may cache them under the new
+    generation. Outside of a transaction, that's a single bump.
+    """
+    invalidate(*namespaces)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: invalidate(*namespaces))
+
+
+def get_generation_tag(*namespaces):
+    """
+    A short string identifying the current generations, e.g. for the vary-on
+    arguments of `{% cache %}` template fragments.
+    """
+    return '.'.join('{}'.format(g) for g in get_generations(*namespaces))
+
+
+def versioned_key(key, *namespaces):
+    """
+    Appends the current generation(s) to a cache key. Uses all namespaces
+    when none are given.
+    """
+    return '{}_{}'.format(key, get_generation_tag(*namespaces))
+
+
+def get_response_cache_key(key, *namespaces):
+    """
+    Namespaces a browse response cache key with the current generations of
+    the given (or the default) namespaces. Hashed, since memcached limits
+    keys to 250 characters.
+    """
+    key = versioned_key(key, *namespaces)
+    return 'browse_response_{}'.format(
+        hashlib.md5(key.encode('utf8')).hexdigest())
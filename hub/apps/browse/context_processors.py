@@ -1,8 +1,16 @@
 from django.conf import settings
 from datetime import datetime
 
+from .cache import FEEDS, NAMESPACES, get_generations
+
 def cache_vars(request):
+    # All generations in one cache read
+    generations = [
+        '{}'.format(g) for g in get_generations(*NAMESPACES + (FEEDS,))]
     return {
         'CACHE_TTL_LONG': settings.CACHE_TTL_LONG,
         'CACHE_TTL_SHORT': settings.CACHE_TTL_SHORT,
+        'CACHE_TTL_VERSIONED': settings.CACHE_TTL_VERSIONED,
+        'CACHE_GENERATION': '.'.join(generations[:-1]),
+        'FEEDS_GENERATION': generations[-1],
     }
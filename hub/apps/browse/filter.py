@@ -8,21 +8,24 @@ import django_filters as filters
 from django import forms
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Q, Value
-from django.db.models.functions import Coalesce
-from django.utils.timezone import now
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.utils.timezone import get_current_timezone_name, now
 
 from haystack.inputs import Raw
-from haystack.query import SearchQuerySet
 
+from ..content import fulltext
 from ..content.types.green_power_projects import GreenPowerProject
 from ..content.types.green_funds import GreenFund
 from ..content.models import CONTENT_TYPES, ContentType, Material, Publication
 from ..metadata.models import Organization, ProgramType, SustainabilityTopic, \
     AcademicDiscipline, CourseMaterialType, PublicationMaterialType, \
     GreenPowerInstallation, ConferenceName, InstitutionalOffice, FundingSource
+from ..metadata.registry import metadata_choices
+from .cache import CONTENT, versioned_key
 from .localflavor import CA_PROVINCES, US_STATES
-from .forms import LeanSelectMultiple
+from .forms import LeanMultipleChoiceField, LeanSelectMultiple
+from .hits import get_search_hits
 from .widgets import GalleryViewWidget
 
 logger = getLogger(__name__)
@@ -33,6 +36,66 @@ ALL = (('', 'All'),)
 """
 
 
+def semi_join(*args, **kwargs):
+    """
+    A condition matching the resources for which the given lookups, which
+    may span M2M relations, hold. The lookups go into a subquery,
+    `pk IN (SELECT ...)`, which Postgres runs as a semi join, like `EXISTS`.
+    Unlike filtering through the joins, that can't repeat a resource, so the
+    browse queryset doesn't need a `DISTINCT`.
+    """
+    return Q(pk__in=ContentType.objects.filter(*args, **kwargs).values('pk'))
+
+
+def get_year_histogram(ContentTypeClass, field_name):
+    """
+    The number of published resources of `ContentTypeClass` per year of the
+    date(time) field `field_name`, as a list of `(year, count)` tuples, newest
+    year first.
+
+    Built with a single grouped query and cached per content type and field.
+    """
+    cache_key = versioned_key('year_histogram_{}_{}'.format(
+        ContentTypeClass._meta.model_name, field_name), CONTENT)
+    histogram = cache.get(cache_key)
+    if histogram is None:
+        field = ContentType._meta.get_field(field_name)
+        column = '{}.{}'.format(
+            connection.ops.quote_name(ContentType._meta.db_table),
+            connection.ops.quote_name(field.column))
+
+        if field.get_internal_type() == 'DateTimeField':
+            tzname = get_current_timezone_name() if settings.USE_TZ else None
+            year_sql, year_params = connection.ops.datetime_extract_sql(
+                'year', column, tzname)
+        else:
+            year_sql, year_params = connection.ops.date_extract_sql(
+                'year', column), []
+
+        qs = ContentTypeClass.objects.published().filter(
+            **{'{}__isnull'.format(field_name): False})
+        rows = (qs.extra(select={'year': year_sql}, select_params=year_params)
+                  .values('year')
+                  .annotate(count=Count('pk'))
+                  .order_by('-year'))
+        histogram = [(int(row['year']), row['count']) for row in rows]
+        cache.set(cache_key, histogram, settings.CACHE_TTL_VERSIONED)
+    return histogram
+
+
+def get_year_choices(ContentTypeClass, field_name):
+    """
+    Filter choices for each year that has resources, labeled with the number
+    of resources.
+    """
+    histogram = get_year_histogram(ContentTypeClass, field_name)
+    if not histogram:
+        return ((now().year, now().year),)
+    return [
+        (year, '{} ({})'.format(year, count)) for year, count in histogram
+    ]
+
+
 # =============================================================================
 # Generic Filter
 # =============================================================================
@@ -53,23 +116,34 @@ class GalleryFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if value == 'gallery':
             # filter the qs for only those with resources with images
-            qs = qs.filter(images__isnull=False).distinct()
+            qs = qs.filter(semi_join(images__isnull=False))
         return qs
 
 
 class SearchFilter(filters.CharFilter):
     """
     Search currently searches the title against the given keyword.
+
+    Only the `max_hits` best hits are fetched from the search backend, if
+    set. The browse view sets it for keyword searches without other filters,
+    so broad keywords don't load every hit. The hits are cached
+    per keyword, see `hits.py`.
+
+    With `KEYWORD_SEARCH_BACKEND = 'postgres'` the keyword is matched in the
+    same query as the other filters instead, see `content/fulltext.py`.
     """
+    max_hits = None
 
     def filter(self, qs, value):
         if not value:
             return qs
 
-        result_ids = (SearchQuerySet().auto_query(value)
-                                      .values_list('ct_pk', flat=True))
+        if fulltext.is_enabled():
+            return fulltext.search(qs, value)
 
-        items = qs.filter(pk__in=result_ids).distinct()
+        result_ids = get_search_hits(value, self.max_hits)
+
+        items = qs.filter(pk__in=result_ids)
         setattr(items, '__search_ordering__', True)
         setattr(items, '__result_ids__', result_ids)
 
@@ -80,18 +154,8 @@ class TopicFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
-        topic_choices = cache.get('topic_filter_choices')
-        if not topic_choices:
-            topic_choices = SustainabilityTopic.objects.values_list(
-                'slug', 'name')
-            cache.set(
-                'topic_filter_choices',
-                topic_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': topic_choices,
+            'choices': metadata_choices(SustainabilityTopic, 'slug'),
             'label': 'Sustainability Topic',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -100,7 +164,7 @@ class TopicFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(topics__slug__in=value)
+        return qs.filter(semi_join(topics__slug__in=value))
 
 
 class ContentTypesFilter(filters.ChoiceFilter):
@@ -130,20 +194,16 @@ class ContentTypesFilter(filters.ChoiceFilter):
 
 
 class OrganizationFilter(filters.ChoiceFilter):
-    field_class = forms.fields.MultipleChoiceField
+    """
+    Only the selected organizations are looked up, to validate and render
+    them. The options are loaded from the API, see `selectize-dropdowns.js`.
+    """
+    field_class = LeanMultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-        # @todo: do I really need to load all the organizations,
-        # or can I just load the selected ones?
-
-        organizations = cache.get('org_filter_choices')
-        if not organizations:
-            organizations = Organization.objects.values_list('pk', 'org_name')
-            cache.set(
-                'org_filter_choices', organizations, settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': organizations,
+            'queryset': Organization.objects.all(),
+            'label_field': 'org_name',
             'label': 'Organization(s)',
             'widget': LeanSelectMultiple,
         })
@@ -152,77 +212,108 @@ class OrganizationFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(organizations__in=value)
+        return qs.filter(semi_join(organizations__in=value))
 
 
 class TagFilter(filters.ChoiceFilter):
-    field_class = forms.fields.MultipleChoiceField
+    """
+    Only the selected tags are looked up, to validate and render them. Only
+    tags of published resources are valid, most used first.
+    """
+    field_class = LeanMultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-        # @todo: how to avoid loading this every time?
-        # it would be nice if the choices could only be the selected values
-        # although I guess this provides some degree of validation
-
-        tag_list = cache.get('tag_filter_choices')
-        if not tag_list:
-            tag_choices = ContentType.keywords.tag_model.objects.distinct(
-                'name')
-            tag_choices = tag_choices.values_list('slug', 'name')
-            tag_list = [(slug, name) for slug, name in tag_choices]
-            cache.set('tag_filter_choices', tag_list, settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': tag_list,
+            'queryset': ContentType.keywords.tag_model.objects.filter(
+                usage__published_count__gt=0).order_by(
+                    '-usage__published_count', 'name'),
+            'value_field': 'slug',
             'label': 'Tag(s)',
             'widget': LeanSelectMultiple,
         })
         super(TagFilter, self).__init__(*args, **kwargs)
 
     def filter(self, qs, value):
-
-        new_qs = qs
+        # Resources need all of the selected tags
         for slug in value:
-            new_qs = new_qs.filter(keywords__slug=slug)
-        return new_qs
+            qs = qs.filter(semi_join(keywords__slug=slug))
+        return qs
+
+
+class RangeBucketFilter(filters.ChoiceFilter):
+    """
+    Filters a numeric field by one or more ranges ("buckets").
 
+    The selected buckets are compiled into a single OR'ed range predicate on
+    `range_field`, a lookup path relative to `ContentType`. That works across
+    the joins to sub classes and related models alike, e.g.
+    `greenfund__student_fee` or `organizations__enrollment_fte`.
 
-class StudentFteFilter(filters.ChoiceFilter):
+    `BUCKETS` maps choice values to `(label, (min, max))`. Ranges are half
+    open, `min <= value < max`. `None` leaves a side unbounded.
+    """
     field_class = forms.fields.MultipleChoiceField
-    STUDENT_CHOICES_MAP = OrderedDict([
-        # {name: (label, min/max)}
-        ('lt_5000', ('<5000', (None, 5000))),
-        ('5k_10k', ('5000-10,000', (5000, 10000))),
-        ('10k_20k', ('10,000-20,000', (10000, 20000))),
-        ('gt_20k', ('>20,000', (20000, None))),
-    ])
+    range_field = None
+    filter_label = None
+    BUCKETS = OrderedDict()
 
     def __init__(self, *args, **kwargs):
         kwargs.update({
             'choices': [
-                (i[0], i[1][0]) for i in self.STUDENT_CHOICES_MAP.items()
+                (key, label) for key, (label, _) in self.BUCKETS.items()
             ],
-            'label': 'Student FTE',
+            'label': self.filter_label,
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
-        super(StudentFteFilter, self).__init__(*args, **kwargs)
+        super(RangeBucketFilter, self).__init__(*args, **kwargs)
 
-    def filter(self, qs, value):
-        if not value:
+    def get_range_query(self, values):
+        query = Q()
+        for value in values:
+            min, max = self.BUCKETS[value][1]
+            bucket = Q()
+            if min is not None:
+                bucket &= Q(**{'{}__gte'.format(self.range_field): min})
+            if max is not None:
+                bucket &= Q(**{'{}__lt'.format(self.range_field): max})
+            query |= bucket
+        return query
+
+    def filter(self, qs, values):
+        if not values:
             return qs
+        return qs.filter(self.get_range_query(values))
 
-        # OPTIMIZE: this loads a big chunk of organizations just to use a
-        # very little of them to filter the result queryset down.
-        org_list = []
-        for v in value:
-            min, max = self.STUDENT_CHOICES_MAP[v][1]
-            org_list += Organization.objects.in_fte_range(min, max)
-        return qs.filter(organizations__in=org_list).distinct()
+
+class StudentFteFilter(RangeBucketFilter):
+    range_field = 'organizations__enrollment_fte'
+    filter_label = 'Student FTE'
+    BUCKETS = OrderedDict([
+        ('lt_5000', ('<5000', (None, 5000))),
+        ('5k_10k', ('5000-10,000', (5000, 10000))),
+        ('10k_20k', ('10,000-20,000', (10000, 20000))),
+        ('gt_20k', ('>20,000', (20000, None))),
+    ])
+
+    def get_range_query(self, values):
+        # Match `Organization.objects`, which hides excluded organizations
+        query = super(StudentFteFilter, self).get_range_query(values)
+        return semi_join(query, organizations__exclude_from_website=False)
 
 
 class CountryFilter(filters.ChoiceFilter):
     def __init__(self, *args, **kwargs):
+        # A callable, like `PublishedFilter`, so new countries show up
+        kwargs.update({
+            'choices': self.get_choices,
+            'label': 'Country/ies',
+        })
+        super(CountryFilter, self).__init__(*args, **kwargs)
 
-        countries = cache.get('country_filter_choices')
+    @staticmethod
+    def get_choices():
+        cache_key = versioned_key('country_filter_choices', CONTENT)
+        countries = cache.get(cache_key)
         if not countries:
             qs = ContentType.objects.published().order_by(
                 'organizations__country')
@@ -233,18 +324,13 @@ class CountryFilter(filters.ChoiceFilter):
                 [c for c in qs if (c[0] is not None and c[0] is not '')])
 
             cache.set(
-                'country_filter_choices', countries, settings.CACHE_TTL_SHORT)
-
-        kwargs.update({
-            'choices': countries,
-            'label': 'Country/ies',
-        })
-        super(CountryFilter, self).__init__(*args, **kwargs)
+                cache_key, countries, settings.CACHE_TTL_VERSIONED)
+        return countries
 
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(organizations__country_iso=value)
+        return qs.filter(semi_join(organizations__country_iso=value))
 
 
 class BaseStateFilter(filters.ChoiceFilter):
@@ -261,7 +347,7 @@ class BaseStateFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(organizations__state__in=value)
+        return qs.filter(semi_join(organizations__state__in=value))
 
 
 class StateFilter(BaseStateFilter):
@@ -286,43 +372,18 @@ class PublishedFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
-        year_choices = cache.get('publish_year_filter_choices')
-        if not year_choices:
-            year_choices = self.get_choices()
-            cache.set(
-                'publish_year_filter_choices',
-                year_choices,
-                settings.CACHE_TTL_SHORT)
-
+        # Filters are instantiated at import time. A callable is evaluated
+        # whenever the form field's choices are, so they don't go stale.
         kwargs.update({
-            'choices': year_choices,
+            'choices': self.get_choices,
             'label': 'Year Posted',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
         super(PublishedFilter, self).__init__(*args, **kwargs)
 
-    def get_choices(self):
-
-        qs = ContentType.objects.published()
-
-        # Find the minimum and maximum year of all ct's and put them
-        # in a range for choices.
-        # @todo - add caching here for performance
-        min_year = qs.order_by('published').first()
-        max_year = qs.order_by('-published').first()
-
-        if not min_year or not max_year:
-            year_choices = ((now().year, now().year),)
-        elif min_year.published.year == max_year.published.year:
-            year_choices = (
-                (min_year.published.year, min_year.published.year),
-            )
-        else:
-            year_choices = [(i, i) for i in range(
-                max_year.published.year + 1, min_year.published.year, -1)]
-
-        return year_choices
+    @staticmethod
+    def get_choices():
+        return get_year_choices(ContentType, 'published')
 
     def filter(self, qs, value):
         if not value:
@@ -331,10 +392,27 @@ class PublishedFilter(filters.ChoiceFilter):
         return qs.filter(query)
 
 
+# `generate_subscripts` rather than `unnest(...) WITH ORDINALITY`, which
+# needs Postgres 9.4
+SEARCH_RANK_SQL = (
+    'SELECT rank.position '
+    'FROM (SELECT hits.ids[i] AS id, i AS position '
+    'FROM (SELECT %s::integer[] AS ids) AS hits, '
+    'generate_subscripts(hits.ids, 1) AS i) AS rank '
+    'WHERE rank.id = {column}')
+
+
 class OrderingFilter(filters.ChoiceFilter):
+    """
+        Sorts the resources. Takes an optional argument of ContentTypeClass,
+        which adds the content type's own `ordering_options`.
+    """
     field_class = forms.fields.ChoiceField
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, ContentTypeClass=ContentType, *args, **kwargs):
+        self.custom_ordering = OrderedDict(
+            (value, order_by)
+            for value, _, order_by in ContentTypeClass.ordering_options())
         kwargs.update({
             'choices': (
                 ('', '---'),
@@ -342,23 +420,39 @@ class OrderingFilter(filters.ChoiceFilter):
                 ('content_type', 'Content Type'),
                 ('-published', 'Date Posted'),
                 ('-date_created', "Date Created, Published, Presented")
-            ),
+            ) + tuple(
+                (value, label)
+                for value, label, _ in ContentTypeClass.ordering_options()),
             'label': 'Sort by',
         })
         super(OrderingFilter, self).__init__(*args, **kwargs)
 
     def filter(self, qs, value):
 
-        if not value and hasattr(qs, '__search_ordering__'):
-            result_ids = qs.__result_ids__
-            clauses = ' '.join(['WHEN id=%s THEN %s' % (pk, i)
-                                for i, pk in enumerate(result_ids)])
-            ordering = 'CASE %s END' % clauses
-            items = qs.filter(pk__in=result_ids).extra(
-                select={'ordering': ordering}, order_by=('ordering',))
-            return items
+        if not value and fulltext.is_ranked(qs):
+            return qs.order_by('-search_rank', '-published')
+        elif not value and hasattr(qs, '__search_ordering__'):
+            # Rank each row by its position in the search results, looked up
+            # in an array passed as a single query parameter.
+            ordering = SEARCH_RANK_SQL.format(
+                column='{}.{}'.format(
+                    connection.ops.quote_name(ContentType._meta.db_table),
+                    connection.ops.quote_name(ContentType._meta.pk.column)))
+            return qs.extra(
+                select={'search_rank': ordering},
+                select_params=(list(qs.__result_ids__),),
+                order_by=('search_rank',))
         elif not value:
             return qs.order_by('-published')
+        elif value in self.custom_ordering:
+            # Sorted with a join on the sub class table, nulls last
+            order_by = self.custom_ordering[value]
+            isnull = Q(**{'{}__isnull'.format(order_by.lstrip('-')): True})
+            return qs.annotate(order_by_isnull=Case(
+                When(isnull, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )).order_by('order_by_isnull', order_by)
         return qs.order_by(value)
 
 
@@ -370,17 +464,8 @@ class ProgramTypeFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
-        program_choices = cache.get('program_type_filter_choices')
-        if not program_choices:
-            program_choices = ProgramType.objects.values_list('pk', 'name')
-            cache.set(
-                'program_type_filter_choices',
-                program_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': program_choices,
+            'choices': metadata_choices(ProgramType),
             'label': 'Program Type',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -406,19 +491,8 @@ class GreenPowerInstallationFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
-        installation_choices = cache.get(
-            'greenpower_installation_filter_choices')
-        if not installation_choices:
-            installation_choices = GreenPowerInstallation.objects.values_list(
-                'pk', 'name')
-            cache.set(
-                'greenpower_installation_filter_choices',
-                installation_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': installation_choices,
+            'choices': metadata_choices(GreenPowerInstallation),
             'label': 'Installation Type',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -463,57 +537,19 @@ class GreenPowerOwnershipFilter(filters.ChoiceFilter):
             ownership_type__in=value).values_list('pk', flat=True))
 
 
-class GreenPowerProjectSizeFilter(filters.ChoiceFilter):
+class GreenPowerProjectSizeFilter(RangeBucketFilter):
     """
     Green Power specific Program Type filter.
     """
-    field_class = forms.fields.MultipleChoiceField
-
-    def __init__(self, *args, **kwargs):
-
-        project_size_choices = (
-            ('lt10', '< 10 kW'),
-            ('10to100', '10 - 100 kW'),
-            ('101to1000', '101 - 1000 kW'),
-            ('1001to5000', '1001 - 5000 kW',),
-            ('gt5000', '> 5000 kW'),
-        )
-
-        kwargs.update({
-            'choices': project_size_choices,
-            'label': 'Project Size',
-            'widget': forms.widgets.CheckboxSelectMultiple(),
-        })
-        super(GreenPowerProjectSizeFilter, self).__init__(*args, **kwargs)
-
-    def filter(self, qs, values):
-        """
-        Filters always work against the base `ContentType` model, not it's
-        sub classes. We have to do a little detour to match them up.
-        """
-        if not values:
-            return qs
-        from ..content.types.green_power_projects import GreenPowerProject
-
-        sizes = [(pk, size) for pk, size in GreenPowerProject.objects.filter(
-            status='published').values_list('pk', 'project_size')]
-
-        gpp_pks = []
-        for value in values:
-            if value == 'lt10':
-                gpp_pks.extend([pk for pk, size in sizes if size < 10])
-            elif value == '10to100':
-                gpp_pks.extend([pk for pk, size in sizes if 10 <= size < 100])
-            elif value == '101to1000':
-                gpp_pks.extend(
-                    [pk for pk, size in sizes if 100 <= size < 1000])
-            elif value == '1001to5000':
-                gpp_pks.extend(
-                    [pk for pk, size in sizes if 1000 <= size < 5000])
-            elif value == 'gt5000':
-                gpp_pks.extend([pk for pk, size in sizes if size >= 5000])
-
-        return qs.filter(pk__in=gpp_pks)
+    range_field = 'greenpowerproject__project_size'
+    filter_label = 'Project Size'
+    BUCKETS = OrderedDict([
+        ('lt10', ('< 10 kW', (None, 10))),
+        ('10to100', ('10 - 100 kW', (10, 100))),
+        ('101to1000', ('101 - 1000 kW', (100, 1000))),
+        ('1001to5000', ('1001 - 5000 kW', (1000, 5000))),
+        ('gt5000', ('> 5000 kW', (5000, None))),
+    ])
 
 
 class InstitutionTypeFilter(filters.ChoiceFilter):
@@ -541,7 +577,6 @@ class InstitutionTypeFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if value:
             cc_values = [x[0] for x in self.carnegie_class_choices]
-            print cc_values
             selected_cc_values = []
             for v in value:
                 # filter according to either carnegie or type
@@ -552,8 +587,7 @@ class InstitutionTypeFilter(filters.ChoiceFilter):
                     pass
             qs_of_orgs = (Organization.objects
                           .filter(institution_type__in=selected_cc_values))
-            filtered_qs = qs.filter(organizations__in=qs_of_orgs)
-            return filtered_qs
+            return qs.filter(semi_join(organizations__in=qs_of_orgs))
         return qs
 
 
@@ -564,9 +598,8 @@ class MaterialTypeFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
         kwargs.update({
-            'choices': CourseMaterialType.objects.values_list('pk', 'name'),
+            'choices': metadata_choices(CourseMaterialType),
             'label': 'Material Type',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -610,7 +643,7 @@ class PublicationTypeFilter(filters.ChoiceFilter):
 
     def __init__(self, *args, **kwargs):
         kwargs.update({
-            'choices': PublicationMaterialType.objects.all().values_list(),
+            'choices': metadata_choices(PublicationMaterialType),
             'label': 'Publication Type',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -637,41 +670,16 @@ class CreatedFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, ContentTypeClass=ContentType, *args, **kwargs):
-
-        year_choices = cache.get('created_year_filter_choices')
-        if not year_choices:
-            year_choices = self.get_choices(ContentTypeClass)
-            cache.set(
-                'created_year_filter_choices',
-                year_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': year_choices,
+            'choices': lambda: self.get_choices(ContentTypeClass),
             'label': 'Year created, published, or presented',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
         super(CreatedFilter, self).__init__(*args, **kwargs)
 
-    def get_choices(self, ContentTypeClass):
-
-        qs = ContentTypeClass.objects.published().filter(
-            date_created__isnull=False)
-        qs = qs.order_by('-date_created')
-
-        # Find the minimum and maximum year of all ct's and put them
-        # in a range for choices.
-        # @todo - add caching here for performance
-        all_dates = qs.values_list('date_created', flat=True)
-        if all_dates:
-            # using set to remove duplicates
-            distinct_years = list(set([d.year for d in all_dates]))
-            distinct_years.sort(reverse=True)
-            year_choices = [(i, i) for i in distinct_years]
-        else:
-            year_choices = ((now().year, now().year),)
-
-        return year_choices
+    @staticmethod
+    def get_choices(ContentTypeClass):
+        return get_year_choices(ContentTypeClass, 'date_created')
 
     def filter(self, qs, value):
         if not value:
@@ -687,18 +695,8 @@ class DisciplineFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-
-        discipline_choices = cache.get('academic_discipline_filter_choices')
-        if not discipline_choices:
-            discipline_choices = AcademicDiscipline.objects.values_list(
-                'pk', 'name')
-            cache.set(
-                'academic_discipline_filter_choices',
-                discipline_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': discipline_choices,
+            'choices': metadata_choices(AcademicDiscipline),
             'label': 'Academic Discipline',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -707,7 +705,7 @@ class DisciplineFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(disciplines__in=value)
+        return qs.filter(semi_join(disciplines__in=value))
 
 
 class ConferenceNameFilter(filters.ChoiceFilter):
@@ -717,17 +715,8 @@ class ConferenceNameFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-        conference_name_choices = cache.get('conference_name_choices')
-        if not conference_name_choices:
-            conference_name_choices = ConferenceName.objects.values_list(
-                'pk', 'name')
-            cache.set(
-                'conference_name_choices',
-                conference_name_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': conference_name_choices,
+            'choices': metadata_choices(ConferenceName),
             'label': 'Conference Name',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -752,18 +741,8 @@ class InstitutionalOfficeFilter(filters.ChoiceFilter):
     field_class = forms.fields.MultipleChoiceField
 
     def __init__(self, *args, **kwargs):
-        institutional_office_choices = cache.get(
-            'institutional_offices_filter_choices')
-        if not institutional_office_choices:
-            institutional_office_choices = InstitutionalOffice.objects.values_list(
-                'pk', 'name')
-            cache.set(
-                'institutional_offices_filter_choices',
-                institutional_office_choices,
-                settings.CACHE_TTL_SHORT)
-
         kwargs.update({
-            'choices': institutional_office_choices,
+            'choices': metadata_choices(InstitutionalOffice),
             'label': 'Office or Department',
             'widget': forms.widgets.CheckboxSelectMultiple(),
         })
@@ -772,117 +751,37 @@ class InstitutionalOfficeFilter(filters.ChoiceFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        return qs.filter(institutions__in=value)
+        return qs.filter(semi_join(institutions__in=value))
 
 
-class GreenFundStudentFeeFilter(filters.ChoiceFilter):
+class GreenFundStudentFeeFilter(RangeBucketFilter):
     """
     Green Fund specific student fee filter.
     """
-    field_class = forms.fields.MultipleChoiceField
-
-    def __init__(self, *args, **kwargs):
-
-        student_fee_choices = (
-            ('lt9', '$1 - $9'),
-            ('10to19', '$10 - $19'),
-            ('20to29', '$20 - $29'),
-            ('30to39', '$30 - $39'),
-            ('40to49', '$40 - $49'),
-            ('gte50', '>= $50'),
-        )
-
-        kwargs.update({
-            'choices': student_fee_choices,
-            'label': 'Typical Annual Fee per Student',
-            'widget': forms.widgets.CheckboxSelectMultiple(),
-        })
-        super(GreenFundStudentFeeFilter, self).__init__(*args, **kwargs)
-
-    def filter(self, qs, values):
-        """
-        Filters always work against the base `ContentType` model, not it's
-        sub classes. We have to do a little detour to match them up.
-        """
-        if not values:
-            return qs
+    range_field = 'greenfund__student_fee'
+    filter_label = 'Typical Annual Fee per Student'
+    BUCKETS = OrderedDict([
+        ('lt9', ('$1 - $9', (1, 10))),
+        ('10to19', ('$10 - $19', (10, 20))),
+        ('20to29', ('$20 - $29', (20, 30))),
+        ('30to39', ('$30 - $39', (30, 40))),
+        ('40to49', ('$40 - $49', (40, 50))),
+        ('gte50', ('>= $50', (50, None))),
+    ])
 
-        fees = [(pk, student_fee) for pk, student_fee in GreenFund.objects.filter(
-            status='published').values_list('pk', 'student_fee')]
 
-        green_fund_pks = []
-        for value in values:
-            if value == 'lt9':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if 0 < student_fee < 10])
-            elif value == '10to19':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if 10 <= student_fee < 20])
-            elif value == '20to29':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if 20 <= student_fee < 30])
-            elif value == '30to39':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if 30 <= student_fee < 40])
-            elif value == '40to49':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if 40 <= student_fee < 50])
-            elif value == 'gte50':
-                green_fund_pks.extend(
-                    [pk for pk, student_fee in fees if student_fee >= 50])
-
-        return qs.filter(pk__in=green_fund_pks)
-
-
-class GreenFundAnnualBudgetFilter(filters.ChoiceFilter):
+class GreenFundAnnualBudgetFilter(RangeBucketFilter):
     """
     Green Fund specific annual budget filter.
     """
-    field_class = forms.fields.MultipleChoiceField
-
-    def __init__(self, *args, **kwargs):
-
-        annual_budget_choices = (
-            ('lt100000', '$1 - $99,999'),
-            ('100000to499999', '$100,000 - $499,999'),
-            ('500000to999999', '$500,000 - $999,999'),
-            ('gte1000000', '>= $1,000,000'),
-        )
-
-        kwargs.update({
-            'choices': annual_budget_choices,
-            'label': 'Approximate Annual Budget',
-            'widget': forms.widgets.CheckboxSelectMultiple(),
-        })
-        super(GreenFundAnnualBudgetFilter, self).__init__(*args, **kwargs)
-
-    def filter(self, qs, values):
-        """
-        Filters always work against the base `ContentType` model, not it's
-        sub classes. We have to do a little detour to match them up.
-        """
-        if not values:
-            return qs
-
-        budgets = [(pk, annual_budget) for pk, annual_budget in GreenFund.objects.filter(
-            status='published').values_list('pk', 'annual_budget')]
-
-        green_fund_pks = []
-        for value in values:
-            if value == 'lt100000':
-                green_fund_pks.extend(
-                    [pk for pk, annual_budget in budgets if 0 < annual_budget < 100000])
-            elif value == '100000to499999':
-                green_fund_pks.extend(
-                    [pk for pk, annual_budget in budgets if 1100000 <= annual_budget < 499999])
-            elif value == '500000to999999':
-                green_fund_pks.extend(
-                    [pk for pk, annual_budget in budgets if 500000 <= annual_budget < 999999])
-            elif value == 'gte1000000':
-                green_fund_pks.extend(
-                    [pk for pk, annual_budget in budgets if annual_budget >= 1000000])
-
-        return qs.filter(pk__in=green_fund_pks)
+    range_field = 'greenfund__annual_budget'
+    filter_label = 'Approximate Annual Budget'
+    BUCKETS = OrderedDict([
+        ('lt100000', ('$1 - $99,999', (1, 100000))),
+        ('100000to499999', ('$100,000 - $499,999', (100000, 500000))),
+        ('500000to999999', ('$500,000 - $999,999', (500000, 1000000))),
+        ('gte1000000', ('>= $1,000,000', (1000000, None))),
+    ])
 
 
 class PrimaryFundingSourceFilter(filters.ChoiceFilter):
@@ -936,59 +835,3 @@ class RevolvingFundFilter(filters.ChoiceFilter):
         values = GreenFund.objects.filter(
             revolving_fund=value).values_list('pk', flat=True)
         return qs.filter(pk__in=values)
-
-
-class GreenPowerOrderingFilter(filters.ChoiceFilter):
-    field_class = forms.fields.ChoiceField
-
-    def __init__(self, *args, **kwargs):
-        kwargs.update({
-            'choices': (
-                ('', '---'),
-                ('title', 'Title'),
-                ('content_type', 'Content Type'),
-                ('-published', 'Date Posted'),
-                ('-date_created', 'Date Created, Published, Presented'),
-                ('greenpowerproject', 'Project Size')
-            ),
-            'label': 'Sort by',
-        })
-        super(GreenPowerOrderingFilter, self).__init__(*args, **kwargs)
-
-    def filter(self, qs, value):
-        if not value:
-            return qs.order_by('-published')
-        if value == 'greenpowerproject':
-            list_of_pks = [ob.pk for ob in qs]
-            return (GreenPowerProject.objects.filter(pk__in=list_of_pks)
-                    .order_by('-project_size'))
-        return qs.order_by(value)
-
-
-class GreenFundOrderingFilter(filters.ChoiceFilter):
-    field_class = forms.fields.ChoiceField
-
-    def __init__(self, *args, **kwargs):
-        kwargs.update({
-            'choices': (
-                ('', '---'),
-                ('title', 'Title'),
-                ('content_type', 'Content Type'),
-                ('-published', 'Date Posted'),
-                ('-date_created', 'Date Created, Published, Presented'),
-                ('student_fee', 'Student Fee (largest)'),
-                ('annual_budget', 'Annual Budget (largest)')
-            ),
-            'label': 'Sort by',
-        })
-        super(GreenFundOrderingFilter, self).__init__(*args, **kwargs)
-
-    def filter(self, qs, value):
-        if not value:
-            return qs.order_by('-published')
-        if value == 'student_fee' or value == 'annual_budget':
-            list_of_pks = [ob.pk for ob in qs]
-            return (GreenFund.objects.filter(pk__in=list_of_pks)
-                    .annotate(value_null=Coalesce(value, Value(-100000000)))
-                    .order_by('-value_null'))
-        return qs.order_by(value)
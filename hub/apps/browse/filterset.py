@@ -114,7 +114,7 @@ class GreenPowerBrowseFilterSet(CustomFilterSet):
     ownership = GreenPowerOwnershipFilter()
     project_size = GreenPowerProjectSizeFilter()
     created = CreatedFilter(GreenPowerProject)
-    order = GreenPowerOrderingFilter()
+    order = OrderingFilter(GreenPowerProject)
 
 
 class MaterialBrowseFilterSet(ExlcudeGalleryFilterMixin, CustomFilterSet):
@@ -166,4 +166,4 @@ class GreenFundFilterSet(CustomFilterSet):
     annual_budget = GreenFundAnnualBudgetFilter()
     from ..content.types.green_funds import GreenFund
     created = CreatedFilter(GreenFund)
-    order = GreenFundOrderingFilter()
+    order = OrderingFilter(GreenFund)
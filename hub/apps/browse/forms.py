@@ -4,6 +4,67 @@ from django import forms
 from django.utils.encoding import force_text
 
 
+class LazyChoices(object):
+    """
+    Choices from a queryset, as `(value_field, label_field)` pairs, that are
+    only looked up for the values at hand, see `for_values`. Iterating loads
+    all of them.
+    """
+    def __init__(self, queryset, value_field, label_field):
+        self.queryset = queryset
+        self.value_field = value_field
+        self.label_field = label_field
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __iter__(self):
+        return iter(self.queryset.values_list(
+            self.value_field, self.label_field))
+
+    def for_values(self, values):
+        return self.queryset.filter(**{
+            '{}__in'.format(self.value_field): list(values)
+        }).values_list(self.value_field, self.label_field)
+
+
+class LeanMultipleChoiceField(forms.MultipleChoiceField):
+    """
+    A multiple choice field for large choice tables, e.g. all organizations.
+    Submitted values are validated with a single `<value_field>__in` lookup,
+    and rendered with a lean widget, so the choices are never loaded as a
+    whole.
+    """
+    def __init__(self, queryset, value_field='pk', label_field='name',
+                 *args, **kwargs):
+        kwargs.pop('choices', None)
+        super(LeanMultipleChoiceField, self).__init__(*args, **kwargs)
+        self._choices = self.widget.choices = LazyChoices(
+            queryset, value_field, label_field)
+
+    def validate(self, value):
+        if self.required and not value:
+            raise forms.ValidationError(
+                self.error_messages['required'], code='required')
+        try:
+            found = set(
+                force_text(v) for v, _ in self._choices.for_values(value))
+        except (ValueError, TypeError):
+            # Values of the wrong type for the lookup, e.g. a non numeric pk
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': ', '.join(force_text(v) for v in value)},
+            )
+        for val in value:
+            if force_text(val) not in found:
+                raise forms.ValidationError(
+                    self.error_messages['invalid_choice'],
+                    code='invalid_choice',
+                    params={'value': val},
+                )
+
+
 class LeanSelect(forms.Select):
     """
     Works like a regular SelectMultiple widget but only renders a list of
@@ -12,8 +73,14 @@ class LeanSelect(forms.Select):
     def render_options(self, choices, selected_choices):
         # Normalize to strings.
         selected_choices = set(force_text(v) for v in selected_choices)
+        if isinstance(self.choices, LazyChoices):
+            # Only look up the selected choices
+            choices = chain(
+                self.choices.for_values(selected_choices), choices)
+        else:
+            choices = chain(self.choices, choices)
         output = []
-        for option_value, option_label in chain(self.choices, choices):
+        for option_value, option_label in choices:
             if not force_text(option_value) in selected_choices:
                 continue
             output.append(self.render_option(
@@ -0,0 +1,72 @@
+"""
+Cached search hits.
+
+`SearchFilter` only needs the ordered `ct_pk` values of the hits for a
+keyword; the other filters, the sort order and the page are applied in the
+database. So the hits are cached per normalized keyword (lower case, single
+spaces, no stop words outside of quoted phrases), and every filter and page
+variant of a popular keyword is served by one search backend call.
+
+The cached hits are keyed with the `search` generation, which the indexing
+pipeline bumps after every index update, see `indexing.update_index`.
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..content.search import get_terms, join_terms, keyword_query
+from .cache import SEARCH, versioned_key
+
+# The stop words of the search backend's English analyzer; they don't change
+# the hits
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'if',
+    'in', 'into', 'is', 'it', 'no', 'not', 'of', 'on', 'or', 'such', 'that',
+    'the', 'their', 'then', 'there', 'these', 'they', 'this', 'to', 'was',
+    'will', 'with',
+))
+
+HITS_CACHE_KEY = 'search_hits_{}'
+
+
+def normalize_keywords(keywords):
+    """
+    The keywords in lower case, without stop words and extra whitespace. A
+    query of stop words only is kept as it is. Quoted phrases keep their
+    stop words, which take part in the phrase match.
+    """
+    terms = list(get_terms(keywords.lower()))
+    return join_terms(
+        [term for term in terms if term[1] or term[0] not in STOP_WORDS] or
+        terms)
+
+
+def get_search_hits(keywords, limit=None):
+    """
+    The `ct_pk` values of the (first `limit`) hits for `keywords`, best
+    first. Cached hits are reused as long as they include the first `limit`
+    hits, or all of them.
+    """
+    keywords = normalize_keywords(keywords)
+    key = versioned_key(
+        HITS_CACHE_KEY.format(
+            hashlib.md5(keywords.encode('utf8')).hexdigest()),
+        SEARCH)
+
+    cached = cache.get(key)
+    if cached is not None:
+        hits, complete = cached
+        if complete or (limit is not None and len(hits) >= limit):
+            return hits[:limit]
+
+    sqs = keyword_query(keywords).values_list('ct_pk', flat=True)
+    if limit is not None:
+        sqs = sqs[:limit]
+    hits = [int(pk) for pk in sqs]
+    complete = limit is None or len(hits) < limit
+    cache.set(key, (hits, complete), settings.CACHE_TTL_VERSIONED)
+    return hits
@@ -0,0 +1,166 @@
+import random
+import time
+
+from hub.apps.browse.filter import semi_join
+from hub.apps.content.models import ContentType
+from hub.apps.metadata.models import Organization, SustainabilityTopic
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils.timezone import now
+
+# Saving the synthetic topics bumps the `metadata` cache generation
+THROWAWAY_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark',
+    },
+}
+
+COUNTRIES = ('US', 'CA', 'GB', 'AU')
+STATES = ('CA', 'NY', 'OR', 'TX', 'WA')
+
+# Combinations of M2M filters, as the browse filters apply them: one
+# `filter()` call per filter
+SCENARIOS = (
+    ('two topics', lambda d: [
+        {'topics__slug__in': d['topics'][:2]}]),
+    ('topic + country', lambda d: [
+        {'topics__slug__in': d['topics'][:1]},
+        {'organizations__country_iso': 'US'}]),
+    ('topics + country + states', lambda d: [
+        {'topics__slug__in': d['topics'][:3]},
+        {'organizations__country_iso': 'US'},
+        {'organizations__state__in': STATES[:3]}]),
+    ('ten organizations', lambda d: [
+        {'organizations__in': d['organizations'][:10]}]),
+    ('two tags', lambda d: [
+        {'keywords__slug': d['tags'][0]},
+        {'keywords__slug': d['tags'][1]}]),
+)
+
+
+class Command(BaseCommand):
+    help = """Compare the browse filters' semi join subqueries with filtering
+    through the M2M joins plus DISTINCT, on a synthetic data set. Runs in a
+    transaction that is rolled back, so the data set isn't kept, and with a
+    throwaway cache, so the synthetic metadata doesn't retire the real
+    metadata caches.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resources', type=int, default=5000,
+            help='Number of synthetic resources')
+        parser.add_argument(
+            '--organizations', type=int, default=2000,
+            help='Number of synthetic organizations')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Runs per scenario and strategy, the best one counts')
+
+    @override_settings(CACHES=THROWAWAY_CACHES)
+    def handle(self, *args, **options):
+        random.seed(0)
+        with transaction.atomic():
+            data = self.create_data(
+                options['resources'], options['organizations'])
+
+            print "%-28s %12s %12s %8s" % (
+                'Scenario', 'JOIN+DISTINCT', 'Semi join', 'Results')
+            for name, get_lookups in SCENARIOS:
+                lookups = get_lookups(data)
+                join_time, join_count = self.run(
+                    self.join_queryset(lookups), options['repeat'])
+                semi_time, semi_count = self.run(
+                    self.semi_join_queryset(lookups), options['repeat'])
+                if join_count != semi_count:
+                    self.stderr.write('%s: %d results with joins, %d with '
+                                      'semi joins' % (name, join_count,
+                                                      semi_count))
+                print "%-28s %10.1fms %10.1fms %8d" % (
+                    name, join_time * 1000, semi_time * 1000, semi_count)
+
+            transaction.set_rollback(True)
+
+    def join_queryset(self, lookups):
+        qs = ContentType.objects.published()
+        for lookup in lookups:
+            qs = qs.filter(**lookup)
+        return qs.distinct()
+
+    def semi_join_queryset(self, lookups):
+        qs = ContentType.objects.published()
+        for lookup in lookups:
+            qs = qs.filter(semi_join(**lookup))
+        return qs
+
+    def run(self, qs, repeat):
+        """
+        Times the queries of a browse page: the count and the first page.
+        """
+        best = None
+        for _ in range(repeat):
+            started = time.time()
+            count = qs.count()
+            list(qs.order_by('-published')[:50])
+            elapsed = time.time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, count
+
+    def create_data(self, resource_count, organization_count):
+        topics = [
+            SustainabilityTopic.objects.create(
+                name='Benchmark Topic %d' % i, slug='benchmark-topic-%d' % i)
+            for i in range(10)]
+
+        first_account = (Organization.objects.order_by('-account_num')
+                         .values_list('account_num', flat=True).first() or 0)
+        Organization.objects.bulk_create([
+            Organization(
+                account_num=first_account + i + 1,
+                org_name='Benchmark Organization %d' % i,
+                country_iso=random.choice(COUNTRIES),
+                state=random.choice(STATES),
+                exclude_from_website=0)
+            for i in range(organization_count)])
+        organizations = list(Organization.objects.filter(
+            org_name__startswith='Benchmark Organization ').values_list(
+                'pk', flat=True))
+
+        first_pk = (ContentType.objects.order_by('-pk')
+                    .values_list('pk', flat=True).first() or 0)
+        ContentType.objects.bulk_create([
+            ContentType(
+                content_type='academicprogram',
+                status=ContentType.STATUS_CHOICES.published,
+                published=now(),
+                title='Benchmark Resource %d' % i,
+                slug='benchmark-resource-%d' % i)
+            for i in range(resource_count)])
+        resources = list(ContentType.objects.filter(
+            pk__gt=first_pk).values_list('pk', flat=True))
+
+        # Each resource gets several topics and organizations, so the joins
+        # multiply rows the way real data does
+        TopicThrough = ContentType.topics.through
+        OrganizationThrough = ContentType.organizations.through
+        TopicThrough.objects.bulk_create([
+            TopicThrough(contenttype_id=pk, sustainabilitytopic_id=topic.pk)
+            for pk in resources
+            for topic in random.sample(topics, 3)])
+        OrganizationThrough.objects.bulk_create([
+            OrganizationThrough(contenttype_id=pk, organization_id=org)
+            for pk in resources
+            for org in random.sample(organizations, 3)])
+
+        tags = ['benchmark-tag-%d' % i for i in range(20)]
+        for resource in ContentType.objects.filter(pk__in=resources[:500]):
+            resource.keywords.add(*random.sample(tags, 4))
+
+        return {
+            'topics': [topic.slug for topic in topics],
+            'organizations': organizations,
+            'tags': tags,
+        }
@@ -0,0 +1,133 @@
+"""
+Keyset (seek) pagination for the browse view.
+
+Offset pagination counts the whole result set for every page and gets slower
+the deeper the page, since the database still walks all the skipped rows.
+With keyset pagination the page links carry an opaque `cursor`, the sort
+value and pk of the last resource shown, and the next page starts right
+after that row, so each page is a cheap index range scan. Only the default
+orderings are supported, see `KEYSET_ORDERINGS`.
+
+The total shown above the results is cached, see `BrowseView.get_count`.
+"""
+
+from __future__ import unicode_literals
+
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+# <order value>: (field, descending, value parser)
+KEYSET_ORDERINGS = {
+    '': ('published', True, parse_datetime),
+    '-published': ('published', True, parse_datetime),
+    'title': ('title', False, None),
+}
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(value, pk):
+    # `isoformat` keeps the microseconds, unlike `DjangoJSONEncoder`
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode('utf8'))
+
+
+def decode_cursor(cursor, parse=None):
+    """
+    Returns the `(value, pk)` pair of a cursor.
+    """
+    try:
+        value, pk = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('utf8')).decode('utf8'))
+        pk = int(pk)
+        if value is not None and parse:
+            # Raises for values that aren't strings, or invalid dates
+            value = parse(value)
+            if value is None:
+                raise ValueError(value)
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidCursor(cursor)
+    return value, pk
+
+
+class KeysetPage(object):
+    """
+    A page of resources following the row of `cursor`. Provides the parts of
+    Django's `Page` the browse templates use.
+    """
+    def __init__(self, object_list, paginator, cursor, next_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_previous(self):
+        return bool(self.cursor)
+
+    def has_next(self):
+        return bool(self.next_cursor)
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+
+class KeysetPaginator(object):
+    """
+    Pages through `queryset` in the order of `ordering`, a key of
+    `KEYSET_ORDERINGS`. `count` is the (cached) total for display only.
+    """
+    def __init__(self, queryset, per_page, ordering, count):
+        self.field, self.descending, self.parse = KEYSET_ORDERINGS[ordering]
+        sign = '-' if self.descending else ''
+        self.queryset = queryset.order_by(
+            '{}{}'.format(sign, self.field), '{}pk'.format(sign))
+        self.per_page = per_page
+        self.count = count
+
+    def get_seek_filter(self, value, pk):
+        """
+        Everything after the row `(value, pk)` in the page order. Postgres
+        sorts NULLs as the largest values, so first in descending order.
+        """
+        after = 'lt' if self.descending else 'gt'
+        field = self.field
+        if value is None:
+            query = Q(**{'{}__isnull'.format(field): True,
+                         'pk__{}'.format(after): pk})
+            if self.descending:
+                query |= Q(**{'{}__isnull'.format(field): False})
+            return query
+        query = (
+            Q(**{'{}__{}'.format(field, after): value}) |
+            Q(**{field: value, 'pk__{}'.format(after): pk}))
+        if not self.descending:
+            query |= Q(**{'{}__isnull'.format(field): True})
+        return query
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(self.get_seek_filter(
+                *decode_cursor(cursor, self.parse)))
+
+        # One extra row tells whether there is a next page
+        object_list = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            last = object_list[-1]
+            next_cursor = encode_cursor(getattr(last, self.field), last.pk)
+        return KeysetPage(object_list, self, cursor, next_cursor)
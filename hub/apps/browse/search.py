@@ -0,0 +1,141 @@
+"""
+Search backed keyword browse.
+
+A keyword search that only uses the filters below is paged, counted and
+filtered inside the search index. The database is only queried for the rows
+on the current page. Any other filter, a custom sort order or the gallery
+view fall back to filtering the database with the search hits, see
+`SearchFilter`.
+"""
+
+from __future__ import unicode_literals
+
+from django.core.paginator import Page, Paginator
+from haystack.query import SQ
+
+from ..content.models import ContentType
+from ..content.search import keyword_query
+
+# Filter names supported by the search index, with the index field they
+# filter on. Values of any selected choice match.
+SEARCH_FILTERS = {
+    'content_type': 'content_type_exact',
+    'topics': 'topics_exact',
+    'discipline': 'disciplines_exact',
+    'organizations': 'organizations_exact',
+    'country': 'country_iso_exact',
+    'state': 'state_exact',
+    'province': 'state_exact',
+    'published': 'published_year',
+    'created': 'date_created_year',
+    # content type specific
+    'program_type': 'program_type',
+    'material_type': 'material_type',
+    'publication_type': 'material_type',
+    'course_level': 'course_level_exact',
+    'conference_name': 'conf_name',
+    'installation': 'installations_exact',
+    'ownership': 'ownership_type_exact',
+    'funding_source': 'funding_sources_exact',
+    'revolving_fund': 'revolving_fund_exact',
+}
+
+# `RangeBucketFilter`s, with the numeric index field they filter on
+SEARCH_RANGE_FILTERS = {
+    'project_size': 'project_size',
+    'student_fee': 'student_fee',
+    'annual_budget': 'annual_budget',
+}
+
+# Other parameters that may be set without leaving the search index
+NEUTRAL_VALUES = {
+    'search': None,
+    'gallery_view': ('', 'list'),
+    'order': ('',),
+}
+
+
+def can_search_backend_browse(filterset):
+    """
+    Whether the filterset can be handled by the search index alone.
+    """
+    form = filterset.form
+    if not form.is_valid() or not form.cleaned_data.get('search'):
+        return False
+    for name, value in form.cleaned_data.items():
+        if (
+            not value or
+            name in SEARCH_FILTERS or
+            name in SEARCH_RANGE_FILTERS
+        ):
+            continue
+        allowed = NEUTRAL_VALUES.get(name, ())
+        if allowed is not None and value not in allowed:
+            return False
+    return True
+
+
+def is_keyword_only(filterset):
+    """
+    Whether the filterset has a keyword and no other filters, only perhaps
+    a sort order or the list view.
+    """
+    form = filterset.form
+    if not form.is_valid() or not form.cleaned_data.get('search'):
+        return False
+    for name, value in form.cleaned_data.items():
+        if not value:
+            continue
+        allowed = NEUTRAL_VALUES.get(name, ())
+        if allowed is not None and value not in allowed:
+            return False
+    return True
+
+
+def get_search_queryset(filterset):
+    """
+    The `ct_pk` values of all hits for the keyword and filters of the given
+    (valid) filterset, in order of relevance.
+    """
+    data = filterset.form.cleaned_data
+    sqs = keyword_query(data['search'])
+
+    for name, field in SEARCH_FILTERS.items():
+        values = data.get(name)
+        if not values:
+            continue
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        sqs = sqs.filter(**{'{}__in'.format(field): values})
+
+    for name, field in SEARCH_RANGE_FILTERS.items():
+        values = data.get(name)
+        if not values:
+            continue
+        query = SQ()
+        for value in values:
+            min, max = filterset.filters[name].BUCKETS[value][1]
+            bucket = SQ()
+            if min is not None:
+                bucket &= SQ(**{'{}__gte'.format(field): min})
+            if max is not None:
+                bucket &= SQ(**{'{}__lt'.format(field): max})
+            query |= bucket
+        sqs = sqs.filter(query)
+
+    return sqs.values_list('ct_pk', flat=True)
+
+
+class SearchPaginator(Paginator):
+    """
+    Pages through search hits (`ct_pk` values) and only loads the resources
+    of the current page, with their images and organizations, keeping the
+    search order.
+    """
+    def _get_page(self, object_list, number, paginator):
+        pks = [int(pk) for pk in object_list]
+        resources = ContentType.objects.published().for_result_list() \
+            .in_bulk(pks)
+        return Page(
+            [resources[pk] for pk in pks if pk in resources],
+            number, paginator)
@@ -2,12 +2,15 @@ from __future__ import unicode_literals
 
 from logging import getLogger
 
+from django.conf import settings
+from django.core.cache import cache
 from django.forms import widgets
 from django.template import Library
 from django.utils.safestring import mark_safe
 from django.template.loader import render_to_string
 
 from ....permissions import get_aashe_member_flag
+from ..cache import get_generation_tag
 
 logger = getLogger(__name__)
 register = Library()
@@ -54,6 +57,56 @@ def permission_flag(obj, user, icon_only=False):
     return mark_safe(label.format(label='Login Required'))
 
 
+ROW_CACHE_KEY = (
+    'result_row_{name}_{staff}_{pk}_{version:%Y%m%d%H%M%S%f}_{generation}')
+
+# Rendered into cached rows in place of the (user dependent) lock icon
+PERMISSION_FLAG_MARKER = mark_safe('<!-- permission_flag -->')
+
+
+@register.simple_tag(takes_context=True)
+def cached_result_rows(context, object_list, name):
+    """
+    Renders each resource of a result page with the template
+    `browse/results/includes/<name>.html` and returns the list of rows.
+
+    Rendering a row (markdown, truncation, typogrify) is costly, and the
+    same for every visitor, so rows are cached per resource version, i.e.
+    its `modified` timestamp, and the cache generations, since rows show
+    related objects like topics. Only the lock icon depends on the visitor,
+    it's rendered per request, see `permission_flag`.
+    """
+    user = context['user']
+    object_list = list(object_list)
+    template_name = 'browse/results/includes/{}.html'.format(name)
+    generation = get_generation_tag()
+    keys = [
+        ROW_CACHE_KEY.format(
+            name=name, staff=int(user.is_staff), pk=obj.pk,
+            version=obj.modified, generation=generation)
+        for obj in object_list
+    ]
+    rows = cache.get_many(keys)
+
+    missing = {}
+    for key, obj in zip(keys, object_list):
+        if key not in rows:
+            missing[key] = render_to_string(template_name, {
+                'obj': obj,
+                'is_staff': user.is_staff,
+                'permission_flag': PERMISSION_FLAG_MARKER,
+            })
+    if missing:
+        cache.set_many(missing, settings.CACHE_TTL_VERSIONED)
+        rows.update(missing)
+
+    return [
+        mark_safe(rows[key].replace(
+            PERMISSION_FLAG_MARKER, permission_flag(obj, user, True)))
+        for key, obj in zip(keys, object_list)
+    ]
+
+
 # <widget>: <template name to render>
 FIELD_MAP = {
     widgets.HiddenInput: 'hidden',
@@ -1,26 +1,33 @@
 from __future__ import unicode_literals
 
+import hashlib
 from collections import defaultdict
 from logging import getLogger
 
-import feedparser
 from django.conf import settings
 from django.core.urlresolvers import reverse
-from django.db.models import Count, CharField, Value as V
 from django.db.models import ObjectDoesNotExist
-from django.db.models import Q
-from django.db.models.functions import Concat
-from django.http import Http404, HttpResponseForbidden, HttpResponseRedirect
-from django.shortcuts import get_object_or_404, render
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseForbidden, \
+    HttpResponseRedirect
+from django.shortcuts import render
 from django.utils.text import slugify
 from django.views.generic import DetailView, ListView, TemplateView
 from ratelimit.mixins import RatelimitMixin
 from tagulous.views import autocomplete
 
-from hub.apps.content.types.green_power_projects import GreenPowerProject
+from ..content import fulltext
 from ..content.models import CONTENT_TYPES, ContentType
-from ..metadata.models import SustainabilityTopic, SustainabilityTopicFavorite, GreenPowerInstallation
+from ..content.summary import get_summary_context
+from ..metadata.models import SustainabilityTopic, SustainabilityTopicFavorite
+from ..metadata.registry import get_metadata
 from ...permissions import get_aashe_member_flag
+from .cache import CONTENT, FEEDS, METADATA, NAMESPACES, \
+    get_response_cache_key, versioned_key
+from .pagination import KEYSET_ORDERINGS, InvalidCursor, KeysetPage, \
+    KeysetPaginator
+from .search import SearchPaginator, can_search_backend_browse, \
+    get_search_queryset, is_keyword_only
 
 logger = getLogger(__name__)
 
@@ -36,7 +43,7 @@ class HomeView(TemplateView):
     def get_context_data(self, **kwargs):
         ctx = super(HomeView, self).get_context_data(**kwargs)
         ctx.update({
-            'topic_list': SustainabilityTopic.objects.all(),
+            'topic_list': get_metadata(SustainabilityTopic),
             'content_type_list': CONTENT_TYPES,
         })
         return ctx
@@ -62,6 +69,9 @@ class BrowseView(RatelimitMixin, ListView):
     content_type_class = None
     sustainabilty_topic = None
     paginate_by = 50
+    search_max_hits = 1000
+    cursor_kwarg = 'cursor'
+    filterset = None
     filterset_form = None
 
     # Rate-limiting
@@ -77,8 +87,10 @@ class BrowseView(RatelimitMixin, ListView):
         """
         # Load the specified SustainabilityTopic
         if self.kwargs.get('topic'):
-            self.sustainabilty_topic = get_object_or_404(
-                SustainabilityTopic, slug=self.kwargs['topic'])
+            self.sustainabilty_topic = get_metadata(
+                SustainabilityTopic).get(slug=self.kwargs['topic'])
+            if not self.sustainabilty_topic:
+                raise Http404('This topic does not exist')
 
         # Load the specified Content Type object. Make Content Type a nice
         # little object so it works similar to SustainabilityTopic
@@ -101,6 +113,37 @@ class BrowseView(RatelimitMixin, ListView):
 
         return super(BrowseView, self).dispatch(*args, **kwargs)
 
+    def use_response_cache(self):
+        """
+        Only anonymous pages are cached as a whole. Pages for logged in users
+        show their account details in the header.
+        """
+        return not self.request.user.is_authenticated()
+
+    def get(self, request, *args, **kwargs):
+        """
+        Serve anonymous pages from the response cache. A cache hit skips the
+        filterset, the search and all summary queries, not just the template
+        rendering. See `cache.py` for invalidation.
+        """
+        if not self.use_response_cache():
+            return super(BrowseView, self).get(request, *args, **kwargs)
+
+        namespaces = NAMESPACES
+        if self.sustainabilty_topic:
+            # Topic pages list the stored feed entries
+            namespaces += (FEEDS,)
+        key = get_response_cache_key(self.get_cache_key(), *namespaces)
+        content = cache.get(key)
+        if content is not None:
+            logger.debug('Browse response: cache hit :: {}'.format(key))
+            return HttpResponse(content)
+
+        response = super(BrowseView, self).get(request, *args, **kwargs)
+        response.add_post_render_callback(
+            lambda r: cache.set(key, r.content, settings.CACHE_TTL_VERSIONED))
+        return response
+
     def get_template_names(self):
         """
         If a specific 'topic' is set in the url name, we'll render a template
@@ -169,13 +212,92 @@ class BrowseView(RatelimitMixin, ListView):
             self.get_filterset_data(),
             queryset=ContentType.objects.published())
         # Load form into class, bring it back below in context.
+        self.filterset = filterset
         self.filterset_form = filterset.form
-        return filterset.qs.distinct()
+
+        if self.use_search_backend():
+            return get_search_queryset(filterset)
+
+        if 'search' in filterset.filters:
+            filterset.filters['search'].max_hits = self.get_max_search_hits()
+        # The filters match M2M relations in subqueries, see `semi_join`, so
+        # the results need no `DISTINCT`
+        return filterset.qs.for_result_list()
 
         # @idea - in gallery view, should we return an image queryset to ensure
         # that pagination works and the # of results is correct?
         # for performance we'd likely need a select_ralated on the resource too
 
+    def use_search_backend(self):
+        """
+        Keyword searches with only simple filters are paged and counted in
+        the search index, see `search.py`.
+        """
+        return (
+            settings.SEARCH_BACKED_BROWSE and
+            not fulltext.is_enabled() and
+            can_search_backend_browse(self.filterset))
+
+    def get_paginator(self, queryset, *args, **kwargs):
+        if self.use_search_backend():
+            return SearchPaginator(queryset, *args, **kwargs)
+        return super(BrowseView, self).get_paginator(
+            queryset, *args, **kwargs)
+
+    def get_keyset_ordering(self):
+        """
+        The `KEYSET_ORDERINGS` key to page the current results with, or None
+        for regular offset pagination, see `pagination.py`.
+        """
+        if not settings.BROWSE_KEYSET_PAGINATION or self.use_search_backend():
+            return None
+        form = self.filterset.form
+        if not form.is_valid() or form.cleaned_data.get('search'):
+            return None
+        ordering = form.cleaned_data.get('order') or ''
+        return ordering if ordering in KEYSET_ORDERINGS else None
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_keyset_ordering()
+        if ordering is None:
+            return super(BrowseView, self).paginate_queryset(
+                queryset, page_size)
+
+        paginator = KeysetPaginator(
+            queryset, page_size, ordering, self.get_count(queryset))
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('Invalid page cursor')
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_count(self, queryset):
+        """
+        The number of results, cached until resources or metadata change, so
+        paging through the results doesn't count them again for every page.
+        """
+        key = versioned_key('browse_count_{}'.format(hashlib.md5(
+            '{}'.format(queryset.query).encode('utf8')).hexdigest()),
+            CONTENT, METADATA)
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.CACHE_TTL_VERSIONED)
+        return count
+
+    def get_max_search_hits(self):
+        """
+        Keyword searches without other filters only fetch the best
+        `search_max_hits` hits, so a broad keyword has a bounded cost. The
+        cap doesn't depend on the page, so neither does the result count.
+
+        Filtered searches fetch all hits. Their filters run in the database,
+        after the search, and would miss the matches ranked past a cap.
+        """
+        if not is_keyword_only(self.filterset):
+            return None
+        return self.search_max_hits
+
     def get_cache_key(self):
         """
         Generates a cache key based on:
@@ -210,7 +332,6 @@ class BrowseView(RatelimitMixin, ListView):
 
         if len(key) >= 250:
             # memcache limit of 250 characters - hash the long ones
-            import hashlib
             hashed_key = hashlib.sha224(key).hexdigest()
             return hashed_key
         return key
@@ -224,7 +345,7 @@ class BrowseView(RatelimitMixin, ListView):
             'topic': self.sustainabilty_topic,
             'topic_name': topic_name,
             'topic_slug': slugify(topic_name),
-            'topic_list': SustainabilityTopic.objects.all(),
+            'topic_list': get_metadata(SustainabilityTopic),
             'content_type': self.content_type_class,
             'content_type_list': CONTENT_TYPES,
             'page_title': self.get_title(),
@@ -233,6 +354,18 @@ class BrowseView(RatelimitMixin, ListView):
             'gallery_view': gallery_view,
         })
 
+        # Keyset paginated pages link to the next page with a cursor
+        page = ctx.get('page_obj')
+        if isinstance(page, KeysetPage) and page.has_other_pages():
+            params = self.request.GET.copy()
+            params.pop(self.cursor_kwarg, None)
+            params.pop(self.page_kwarg, None)
+            ctx['keyset_pagination'] = True
+            ctx['first_page_query'] = params.urlencode()
+            if page.has_next():
+                params[self.cursor_kwarg] = page.next_cursor
+                ctx['next_page_query'] = params.urlencode()
+
         # Additional toolkit content for topic views
         if self.sustainabilty_topic:
             # return a an ordered list of SustainabilityTopicFavorite, by order
@@ -257,17 +390,10 @@ class BrowseView(RatelimitMixin, ListView):
                 'new_resources_list': new_resources,
             })
 
-            # Additional Partners Tab content for topic views
-            try:
-                rss_topic_feed = feedparser.parse(
-                    self.sustainabilty_topic.scpd_rss_feed)
-                if 'entries' in rss_topic_feed:
-                    ctx.update({
-                        'feed': rss_topic_feed,
-                    })
-            except Exception as e:  # Any error is bad here, catch all.
-                logger.error('Feed parse failed; {}'.format(feed_address))
-                logger.exception(e)
+            # Additional Partners Tab content for topic views, from the
+            # stored feed entries, see `metadata/feeds.py`
+            ctx['partner_list'] = (
+                self.sustainabilty_topic.get_partner_entries())
 
         # Additional Summary content for content type views
         if self.content_type_class:
@@ -277,215 +403,14 @@ class BrowseView(RatelimitMixin, ListView):
                 .filter(content_type=self.content_type_class.slug)\
                 .order_by('-published')
 
-            # Count unique organizations in this data set
-            orgs = new_resources\
-                .values('organizations__account_num')\
-                .distinct()
-
-            # Count unique countries appearing within these organizations
-            country_counts = new_resources\
-                .values('organizations__country')\
-                .annotate(count=Count('organizations__account_num'))\
-                .order_by()
-
-            # Count unique states appearing within these organizations that
-            # have country=USA
-            state_counts = new_resources\
-                .filter(organizations__country_iso='US')\
-                .values('organizations__state')\
-                .annotate(count=Count('organizations__account_num')).order_by()
-
-            # Count unique states appearing within these organizations
-            # that have country=Canada
-            province_counts = new_resources\
-                .filter(organizations__country_iso='CA')\
-                .values('organizations__state')\
-                .annotate(count=Count('organizations__account_num')).order_by()
-
-            # Construct lists of which types get which graphs
-            topic_graph_allowed = [
-                'Case Studies',
-                'Conference Presentations',
-                'Outreach Materials',
-                'Photographs',
-                'Publications',
-                'Tools',
-                'Videos & Webinars',
-            ]
-            discipline_graph_allowed = [
-                'Academic Programs',
-                'Case Studies',
-                'Course Materials',
-                'Publications',
-                'Research Centers & Institutes',
-            ]
-            installation_type_graph_allowed = [
-                'Green Power Projects'
-            ]
-            funding_source_graph_allowed = [
-                'Green Funds',
-            ]
-
-            label = self.content_type_class.content_type_label()
-
-            # Count unique topics associated with these pieces of content
-            # output a dict of pairs of names and counts
-            topic_counts = None
-            if label in topic_graph_allowed:
-                topic_counts = [
-                    {
-                        'name'.encode("utf8"): t['topics__name'].encode("utf8"),
-                        'count'.encode("utf8"): t['count'],
-                        'link'.encode("utf8"): t['link'].encode("utf8")
-                    }
-                    for t in
-                    new_resources.values('topics__name')
-                    .exclude(Q(topics__name=None))
-                    .annotate(count=Count('id')).order_by('-count')
-                    .annotate(
-                        link=Concat(
-                            V("/browse/types/"),
-                            V(self.content_type_class.slug),
-                            V("/?search=&content_type="),
-                            V(self.content_type_class.slug),
-                            V("&topics="),
-                            'topics__slug',
-                            V("&country=#resources-panel"),
-                            output_field=CharField()
-                        )
-                    )
-                ]
-
-            # Count unique academic disciplines associated with these pieces
-            # of content and output a dict of pairs of names and counts
-            discipline_counts = None
-            if label in discipline_graph_allowed:
-                discipline_counts = [
-                    {
-                        'name'.encode("utf8"): t['disciplines__name']
-                              .encode("utf8"),
-                        'count'.encode("utf8"): t['count'],
-                        'link'.encode("utf8"): t['link'].encode("utf8")
-                    }
-                    for t in
-                    new_resources.values('disciplines__name')
-                    .exclude(Q(disciplines__name=None))
-                    .annotate(count=Count('id')).order_by('-count')
-                    .annotate(
-                        link=Concat(
-                            V("/browse/types/"),
-                            V(self.content_type_class.slug),
-                            V("/?search=&content_type="),
-                            V(self.content_type_class.slug),
-                            V("&discipline="),
-                            'disciplines__pk',
-                            V("&country=#resources-panel"),
-                            output_field=CharField()
-                        )
-                    )
-                ]
-
-            installation_counts = None
-            if label in installation_type_graph_allowed:
-                installation_counts = [
-                    {
-                        'name'.encode("utf8"): t['greenpowerproject__installations__name']
-                        .encode("utf8"),
-                        'count'.encode("utf8"): t['count'],
-                        'link'.encode("utf8"): t['link'].encode("utf8")
-                    }
-                    for t in
-                    new_resources.values(
-                        'greenpowerproject__installations__name')
-                    .exclude(Q(greenpowerproject__installations__name=None))
-                    .annotate(count=Count('id')).order_by('-count')
-                    .annotate(
-                        link=Concat(
-                            V("/browse/types/"),
-                            V(self.content_type_class.slug),
-                            V("/?search=&content_type="),
-                            V(self.content_type_class.slug),
-                            V("&installation="),
-                            'greenpowerproject__installations__pk',
-                            V("&country=#resources-panel"),
-                            output_field=CharField()
-                        )
-                    )
-                ]
-
-            funding_source_counts = None
-            if label in funding_source_graph_allowed:
-                funding_source_counts = [
-                    {
-                        'name'.encode("utf8"): t['greenfund__funding_sources__name']
-                        .encode("utf8"),
-                        'count'.encode("utf8"): t['count'],
-                        'link'.encode("utf8"): t['link'].encode("utf8")
-                    }
-                    for t in
-                    new_resources.values('greenfund__funding_sources__name')
-                    .annotate(count=Count('id')).order_by('-count')
-                    .annotate(
-                        link=Concat(
-                            V("/browse/types/"),
-                            V(self.content_type_class.slug),
-                            V("/?search=&gallery_view=list&content_type="),
-                            V(self.content_type_class.slug),
-                            V("&country="),
-                            V("&funding_source="),
-                            'greenfund__funding_sources__pk',
-                            V('#resources-panel'),
-                            output_field=CharField()
-                        )
-                    )
-                ]
-
-                # http://127.0.0.1:8000/browse/types/greenfund/?search=&gallery_view=list&content_type=greenfund&country=&funding_source=3#resources-panel
-                # http://127.0.0.1:8000/browse/types/greenfund/?search=&gallery_view=list&content_type=greenfund&country=&funding_source=3#resources-panel
-
-            # Get data for the map
-            map_data = [
-                [t[0].encode("utf8"), float(t[1]), float(t[2]), t[3],
-                 t[4], t[5].encode("utf8")]
-                for t in
-                new_resources.exclude(Q(organizations__org_name=None))
-                             .exclude(Q(organizations__latitude=''))
-                             .exclude(Q(organizations__latitude=None))
-                             .values_list('organizations__org_name',
-                                          'organizations__latitude',
-                                          'organizations__longitude',
-                                          'organizations__account_num',
-                                          )
-                             .annotate(
-                    count=Count('organizations__account_num')
-                ).annotate(
-                    link=Concat(
-                        V("/browse/types/"),
-                        V(self.content_type_class.slug),
-                        V("/?search=&content_type="),
-                        V(self.content_type_class.slug),
-                        V("&organizations="),
-                        str('organizations__account_num'),
-                        V("&country=#resources-panel"),
-                        output_field=CharField()
-                    )
-                ).order_by()
-            ]
-
             singular = self.content_type_class._meta.verbose_name
 
-            # Add all of this to the context data
+            # Add all of this to the context data. The organization,
+            # location and chart numbers come from the stored summary
+            # snapshot rather than being aggregated on each request.
+            ctx.update(get_summary_context(self.content_type_class.slug))
             ctx.update({
                 'new_resources_list': new_resources,
-                'orgs': orgs,
-                'country_counts': country_counts,
-                'state_counts': state_counts,
-                'province_counts': province_counts,
-                'topic_counts': topic_counts,
-                'discipline_counts': discipline_counts,
-                'installation_counts': installation_counts,
-                'funding_source_counts': funding_source_counts,
-                'map_data': map_data,
                 'GOOGLE_API_KEY': settings.GOOGLE_API_KEY,
                 'content_type_singular': singular
             })
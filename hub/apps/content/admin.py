@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 
 from django.contrib import admin
+from django.contrib.admin.actions import delete_selected
 from django.core.urlresolvers import reverse
 
 from django.forms import TextInput
@@ -18,6 +19,7 @@ from model_utils import Choices
 
 # Custom model form for the admin
 from django import forms
+from ..browse.cache import CONTENT, invalidate_on_commit
 from ..browse.forms import LeanSelectMultiple
 
 import tagulous
@@ -79,6 +81,23 @@ class ContentTypeResource(ModelResource):
                 self.fields[k].widget.field = v
 
 
+def delete_selected_resources(modeladmin, request, queryset):
+    """
+    The built-in bulk delete deletes the queryset at once, skipping
+    `delete_model`, so this invalidates and refreshes the summaries itself.
+    """
+    resources = dict((obj.content_type, obj) for obj in queryset)
+    response = delete_selected(modeladmin, request, queryset)
+    if response is None:
+        # Deleted, rather than asked for confirmation
+        invalidate_on_commit(CONTENT)
+        for obj in resources.values():
+            obj.refresh_summary()
+    return response
+delete_selected_resources.short_description = \
+    delete_selected.short_description
+
+
 class BaseContentTypeAdmin(ExportMixin, admin.ModelAdmin):
     form = ContentTypeAdminForm
     resource_class = ContentTypeResource
@@ -100,10 +119,37 @@ class BaseContentTypeAdmin(ExportMixin, admin.ModelAdmin):
             elif obj.status == obj.STATUS_CHOICES.declined:
                 utils.send_resource_declined_email(obj, request)
 
+        if status_tracker_changed:
+            invalidate_on_commit(CONTENT)
+
+        # Published resources are summarized in `save_related`, once their
+        # organizations, topics etc. are saved. Anything leaving the published
+        # state, or published through the bulk actions, is summarized here.
+        if status_tracker_changed and (
+                form is None or
+                obj.status != obj.STATUS_CHOICES.published):
+            obj.refresh_summary()
+
     def save_related(self, request, form, formsets, change):
         super(BaseContentTypeAdmin, self).save_related(
             request, form, formsets, change)
         form.instance.create_thumbnails()
+        if form.instance.status == form.instance.STATUS_CHOICES.published:
+            invalidate_on_commit(CONTENT)
+            form.instance.refresh_summary()
+
+    def delete_model(self, request, obj):
+        super(BaseContentTypeAdmin, self).delete_model(request, obj)
+        invalidate_on_commit(CONTENT)
+        obj.refresh_summary()
+
+    def get_actions(self, request):
+        actions = super(BaseContentTypeAdmin, self).get_actions(request)
+        if 'delete_selected' in actions:
+            actions['delete_selected'] = (
+                delete_selected_resources, 'delete_selected',
+                delete_selected_resources.short_description)
+        return actions
 
 
 class SpecificContentTypeAdmin(BaseContentTypeAdmin):
@@ -121,28 +167,6 @@ class SpecificContentTypeAdmin(BaseContentTypeAdmin):
     def submitter_name(self, obj):
         return obj.submitted_by.get_full_name()
 
-    def _update_application_index(self):
-        # from django.core import management
-        # management.call_command('update_index', '{}.{}'.format(
-        #     self.model._meta.app_label,
-        #     self.model._meta.model_name
-        # ))
-        pass
-
-    def response_add(self, request, obj):
-        self._update_application_index()
-        return super(BaseContentTypeAdmin, self).response_add(request, obj)
-
-    def response_change(self, request, obj):
-        self._update_application_index()
-        return super(BaseContentTypeAdmin, self).response_change(request, obj)
-
-    def response_delete(self, request, obj_display, obj_id):
-        self._update_application_index()
-        return super(BaseContentTypeAdmin, self).response_delete(request,
-                                                                 obj_display,
-                                                                 obj_id)
-
 
 class AllContentTypesAdmin(BaseContentTypeAdmin):
     list_display = ('select_link', 'status', 'object_link',
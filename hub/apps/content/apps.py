@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContentTypesConfig(AppConfig):
     name = 'hub.apps.content'
     verbose_name = 'Content Types'
+
+    def ready(self):
+        from .tags import connect_signals
+        connect_signals()
@@ -0,0 +1,113 @@
+"""
+Keyword search in Postgres, an alternative to the Elasticsearch index.
+
+Each resource keeps a weighted `tsvector` in `search_vector`, a column of
+the `content_contenttype` table with a GIN index (content migration 0091).
+The column isn't a model field; Django 1.9 has no type for it. The weights:
+
+    A: the title
+    B: the tags
+    C: the description and organizations
+    D: everything else (topics, disciplines, authors and the fields of the
+       content type), from the content type's search index template
+
+With `KEYWORD_SEARCH_BACKEND = 'postgres'`, keyword searches match, rank and
+filter in a single query, see `search`. The vectors are updated along with
+the search index, by `indexing.update_index`, and built for all resources
+with the `update_search_vectors` command.
+"""
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import connection
+from django.template.loader import render_to_string
+
+from .models import CONTENT_TYPES, ContentType
+
+TEXT_SEARCH_CONFIG = 'english'
+
+COLUMN = 'search_vector'
+
+UPDATE_SQL = (
+    'UPDATE {table} SET {column} = '
+    "setweight(to_tsvector(%(config)s, %(a)s), 'A') || "
+    "setweight(to_tsvector(%(config)s, %(b)s), 'B') || "
+    "setweight(to_tsvector(%(config)s, %(c)s), 'C') || "
+    "setweight(to_tsvector(%(config)s, %(d)s), 'D') "
+    'WHERE {pk} = %(pk)s')
+
+MATCH_SQL = '{column} @@ plainto_tsquery(%s, %s)'
+RANK_SQL = 'ts_rank_cd({column}, plainto_tsquery(%s, %s))'
+
+
+def is_enabled():
+    return settings.KEYWORD_SEARCH_BACKEND == 'postgres'
+
+
+def get_column():
+    return '{}.{}'.format(
+        connection.ops.quote_name(ContentType._meta.db_table),
+        connection.ops.quote_name(COLUMN))
+
+
+def get_document(obj):
+    """
+    The texts of a resource (a content type sub class instance), by weight.
+    """
+    def names(objects, field='name'):
+        return ' '.join(getattr(o, field) or '' for o in objects)
+
+    return {
+        'a': obj.title or '',
+        'b': names(obj.keywords.all()),
+        'c': ' '.join((
+            obj.description or '',
+            names(obj.organizations.all(), 'org_name'),
+        )),
+        'd': render_to_string(
+            'search/indexes/content/{}_text.txt'.format(obj.content_type),
+            {'object': obj}),
+    }
+
+
+def update_search_vectors(content_type, pks):
+    """
+    Updates the search vectors of the given resources of a content type.
+    """
+    from .search import BaseIndex
+
+    model = CONTENT_TYPES[content_type]
+    objects = model.objects.filter(pk__in=pks).prefetch_related(
+        *BaseIndex.prefetch_fields)
+    sql = UPDATE_SQL.format(
+        table=connection.ops.quote_name(ContentType._meta.db_table),
+        column=connection.ops.quote_name(COLUMN),
+        pk=connection.ops.quote_name(ContentType._meta.pk.column))
+    params = []
+    for obj in objects:
+        document = get_document(obj)
+        document.update(config=TEXT_SEARCH_CONFIG, pk=obj.pk)
+        params.append(document)
+    if params:
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+    return len(params)
+
+
+def search(qs, keywords):
+    """
+    Resources of `qs` matching all `keywords`, with their relevance as
+    `search_rank`.
+    """
+    column = get_column()
+    params = [TEXT_SEARCH_CONFIG, keywords]
+    return qs.extra(
+        where=[MATCH_SQL.format(column=column)],
+        params=params,
+        select={'search_rank': RANK_SQL.format(column=column)},
+        select_params=params)
+
+
+def is_ranked(qs):
+    return 'search_rank' in qs.query.extra_select
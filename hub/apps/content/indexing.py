@@ -0,0 +1,136 @@
+"""
+Incremental search indexing.
+
+`QueuedSignalProcessor` picks up every change to a resource, its related
+objects and its authors, and queues the resource for (re-)indexing once the
+transaction is committed. Updates are debounced per resource: while an
+update is pending, further changes to the resource don't queue another one.
+The Celery task `content.update_search_index` then updates the published and
+removes the unpublished resources of its batch, with one backend call per
+index (or updates their Postgres search vectors, see `fulltext.py`),
+retires the cached search hits (the `search` cache generation), and reports
+the time it took from the change to the index as
+`Custom/SearchIndex/Lag`.
+"""
+
+from __future__ import unicode_literals
+
+import time
+from collections import defaultdict
+from logging import getLogger
+
+import newrelic.agent
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from haystack import connection_router, connections
+from haystack.signals import BaseSignalProcessor
+
+from ..browse.cache import SEARCH, invalidate
+from . import fulltext
+from .models import CONTENT_TYPES, Author, ContentType
+
+logger = getLogger(__name__)
+
+QUEUED_KEY = 'search_index_queued_{}'
+
+
+def queue_index_update(items):
+    """
+    Queues `(pk, content_type)` pairs of resources for indexing, unless an
+    update is already pending for them.
+    """
+    from .tasks import update_search_index
+
+    items = [
+        (pk, content_type) for pk, content_type in items
+        if cache.add(QUEUED_KEY.format(pk), True,
+                     settings.SEARCH_INDEX_DEBOUNCE * 10)
+    ]
+    if items:
+        update_search_index.apply_async(
+            args=[items, time.time()],
+            countdown=settings.SEARCH_INDEX_DEBOUNCE)
+
+
+def update_index(items, queued_at=None):
+    """
+    Indexes the published resources of the given `(pk, content_type)` pairs
+    and removes the others from the index.
+    """
+    # Changes from here on have to queue another update
+    cache.delete_many([QUEUED_KEY.format(pk) for pk, _ in items])
+
+    pks_by_type = defaultdict(set)
+    for pk, content_type in items:
+        pks_by_type[content_type].add(pk)
+
+    if fulltext.is_enabled():
+        # Unpublished resources keep their vectors; searches only look at
+        # published ones
+        for content_type, pks in pks_by_type.items():
+            fulltext.update_search_vectors(content_type, pks)
+    else:
+        update_search_backends(pks_by_type)
+    invalidate(SEARCH)
+
+    if queued_at:
+        lag = time.time() - queued_at
+        logger.info('Search index updated for {} resources, lag: {:.1f}s'
+                    .format(len(items), lag))
+        newrelic.agent.record_custom_metric('Custom/SearchIndex/Lag', lag)
+
+
+def update_search_backends(pks_by_type):
+    for using in connection_router.for_write():
+        backend = connections[using].get_backend()
+        unified_index = connections[using].get_unified_index()
+
+        for content_type, pks in pks_by_type.items():
+            model = CONTENT_TYPES[content_type]
+            index = unified_index.get_index(model)
+            published = list(index.index_queryset(using=using).filter(
+                pk__in=pks))
+            if published:
+                backend.update(index, published)
+            for pk in pks - set(obj.pk for obj in published):
+                backend.remove('{}.{}.{}'.format(
+                    model._meta.app_label, model._meta.model_name, pk))
+
+
+class QueuedSignalProcessor(BaseSignalProcessor):
+    """
+    Queues resources for indexing whenever they, their M2M relations (topics,
+    organizations, keywords, ...) or their authors change.
+    """
+    def setup(self):
+        models.signals.post_save.connect(self.handle_save)
+        models.signals.post_delete.connect(self.handle_save)
+        models.signals.m2m_changed.connect(self.handle_m2m_changed)
+
+    def teardown(self):
+        models.signals.post_save.disconnect(self.handle_save)
+        models.signals.post_delete.disconnect(self.handle_save)
+        models.signals.m2m_changed.disconnect(self.handle_m2m_changed)
+
+    def enqueue(self, items):
+        if items:
+            transaction.on_commit(lambda: queue_index_update(items))
+
+    def handle_save(self, sender, instance, **kwargs):
+        if isinstance(instance, ContentType):
+            self.enqueue([(instance.pk, instance.content_type)])
+        elif isinstance(instance, Author) and instance.ct_id:
+            self.enqueue(list(ContentType.objects.filter(
+                pk=instance.ct_id).values_list('pk', 'content_type')))
+
+    def handle_m2m_changed(self, sender, instance, action, reverse, model,
+                           pk_set, **kwargs):
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if isinstance(instance, ContentType):
+            self.enqueue([(instance.pk, instance.content_type)])
+        elif issubclass(model, ContentType) and pk_set:
+            # e.g. `topic.contenttype_set.add(...)`
+            self.enqueue(list(ContentType.objects.filter(
+                pk__in=pk_set).values_list('pk', 'content_type')))
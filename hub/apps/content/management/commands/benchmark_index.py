@@ -0,0 +1,134 @@
+import random
+import time
+
+from hub.apps.content.models import ContentType
+from hub.apps.content.types.academic import AcademicProgram
+from hub.apps.metadata.models import Organization, SustainabilityTopic
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from haystack import connections
+
+# Saving the synthetic topics bumps the `metadata` cache generation
+THROWAWAY_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark',
+    },
+}
+
+WORDS = (
+    'campus energy water waste solar wind student faculty climate carbon '
+    'garden food transit bike building efficiency recycling compost '
+    'curriculum research community health policy green fund program'
+).split()
+
+# How often the index template used to repeat each field to boost it
+REPEATED_LAYOUT = (
+    ('title', 7),
+    ('description', 3),
+    ('tags', 3),
+    ('organization_names', 1),
+    ('text', 1),
+)
+TEXT_FIELDS = [field for field, _ in REPEATED_LAYOUT]
+
+
+def sentence(length):
+    return ' '.join(random.choice(WORDS) for _ in range(length))
+
+
+class Command(BaseCommand):
+    help = """Measure the search documents of a synthetic corpus: their text
+    size with the separate, query time weighted fields, compared to repeating
+    fields in one text blob as the index template used to, and the indexing
+    throughput. Runs in a transaction that is rolled back, so the corpus
+    isn't kept, and with a throwaway cache, so the synthetic metadata doesn't
+    retire the real metadata caches.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resources', type=int, default=1000,
+            help='Number of synthetic resources')
+        parser.add_argument(
+            '--index', action='store_true', default=False,
+            help='Also send the documents to the search backend (and remove '
+                 'them afterwards) to time indexing')
+        parser.add_argument(
+            '--using', default='default',
+            help='The search backend connection to use')
+
+    @override_settings(CACHES=THROWAWAY_CACHES)
+    def handle(self, *args, **options):
+        random.seed(0)
+        using = options['using']
+        index = connections[using].get_unified_index().get_index(
+            AcademicProgram)
+
+        with transaction.atomic():
+            pks = self.create_corpus(options['resources'])
+            objects = list(index.index_queryset(using=using).filter(
+                pk__in=pks))
+
+            started = time.time()
+            documents = [index.full_prepare(obj) for obj in objects]
+            prepare_time = time.time() - started
+
+            weighted_size = sum(
+                len((document.get(field) or '').encode('utf8'))
+                for document in documents for field in TEXT_FIELDS)
+            repeated_size = sum(
+                len((document.get(field) or '').encode('utf8')) * repeat
+                for document in documents
+                for field, repeat in REPEATED_LAYOUT)
+
+            print "%d documents" % len(documents)
+            print "Text size, weighted fields: %10d bytes" % weighted_size
+            print "Text size, repeated fields: %10d bytes" % repeated_size
+            print "Prepared %.0f documents/s" % (
+                len(documents) / max(prepare_time, 1e-6))
+
+            if options['index']:
+                backend = connections[using].get_backend()
+                started = time.time()
+                backend.update(index, objects)
+                index_time = time.time() - started
+                print "Indexed %.0f documents/s" % (
+                    len(objects) / max(index_time, 1e-6))
+                for obj in objects:
+                    backend.remove(obj)
+
+            transaction.set_rollback(True)
+
+    def create_corpus(self, resource_count):
+        topics = [
+            SustainabilityTopic.objects.create(
+                name='Benchmark Topic %d' % i, slug='benchmark-topic-%d' % i)
+            for i in range(10)]
+
+        first_account = (Organization.objects.order_by('-account_num')
+                         .values_list('account_num', flat=True).first() or 0)
+        Organization.objects.bulk_create([
+            Organization(
+                account_num=first_account + i + 1,
+                org_name='Benchmark %s College' % sentence(2).title(),
+                exclude_from_website=0)
+            for i in range(100)])
+        organizations = list(Organization.objects.filter(
+            account_num__gt=first_account))
+
+        tags = ['benchmark %s' % word for word in WORDS]
+        pks = []
+        for i in range(resource_count):
+            resource = AcademicProgram.objects.create(
+                title=sentence(6).capitalize(),
+                description='\n\n'.join(sentence(40) for _ in range(3)),
+                outcomes=sentence(30),
+                status=ContentType.STATUS_CHOICES.published)
+            resource.topics.add(*random.sample(topics, 2))
+            resource.organizations.add(*random.sample(organizations, 2))
+            resource.keywords.add(*random.sample(tags, 4))
+            pks.append(resource.pk)
+        return pks
@@ -0,0 +1,13 @@
+from hub.apps.content.tags import rebuild_tag_usage
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = """Recount the published resources of each tag
+    """
+
+    def handle(self, *args, **options):
+        counts = rebuild_tag_usage()
+        if options['verbosity'] > 1:
+            print "%d tags in use" % len(counts)
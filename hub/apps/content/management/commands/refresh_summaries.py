@@ -0,0 +1,24 @@
+from hub.apps.content.models import CONTENT_TYPES
+from hub.apps.content.summary import refresh_summary
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = """Rebuild the summary tab snapshot for each content type
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'content_types', nargs='*',
+            help='Content type keys to refresh, e.g. academicprogram. '
+                 'Defaults to all content types.')
+
+    def handle(self, *args, **options):
+        content_types = options['content_types'] or CONTENT_TYPES.keys()
+        for ct in content_types:
+            if ct not in CONTENT_TYPES:
+                raise CommandError('Unknown content type: %s' % ct)
+            summary = refresh_summary(ct)
+            if options['verbosity'] > 1:
+                print "%s: %d resources" % (ct, summary['resource_count'])
@@ -0,0 +1,156 @@
+import json
+import multiprocessing
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from haystack import connections as haystack_connections
+
+from hub.apps.browse.cache import SEARCH, invalidate
+from hub.apps.content.models import CONTENT_TYPES
+
+
+def get_index(content_type, using='default'):
+    unified_index = haystack_connections[using].get_unified_index()
+    return unified_index.get_index(CONTENT_TYPES[content_type])
+
+
+def get_shards(content_type, chunk_size, using='default'):
+    """
+    Splits the published resources of a content type into `[start, end]`
+    primary key ranges of (at most) `chunk_size` resources each.
+    """
+    pks = list(get_index(content_type, using).index_queryset(using=using)
+               .order_by('pk').values_list('pk', flat=True))
+    return [
+        [pks[i], pks[min(i + chunk_size, len(pks)) - 1]]
+        for i in range(0, len(pks), chunk_size)
+    ]
+
+
+def index_shard(args):
+    """
+    Renders and submits all resources of one shard to the search backend, in
+    a single bulk request. Runs in the worker processes.
+    """
+    content_type, start, end, using = args
+    index = get_index(content_type, using)
+    objects = list(index.index_queryset(using=using).filter(
+        pk__gte=start, pk__lte=end))
+    if objects:
+        haystack_connections[using].get_backend().update(index, objects)
+    return content_type, start, end, len(objects)
+
+
+def close_connections():
+    """
+    Forked workers must not share the parent's database connections.
+    """
+    for connection in connections.all():
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = """Rebuild the search index for all (or the given) content types.
+
+    Resources are indexed in primary key ranges, in parallel. Finished ranges
+    are recorded in a checkpoint file, so an interrupted run picks up where it
+    left off when started again.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'content_types', nargs='*',
+            help='Content type keys to index, e.g. academicprogram. '
+                 'Defaults to all content types.')
+        parser.add_argument(
+            '--workers', type=int, default=multiprocessing.cpu_count(),
+            help='Number of worker processes')
+        parser.add_argument(
+            '--chunk-size', type=int, default=250,
+            help='Number of resources per bulk request')
+        parser.add_argument(
+            '--checkpoint', default='reindex_checkpoint.json',
+            help='File to record finished ranges in')
+        parser.add_argument(
+            '--restart', action='store_true', default=False,
+            help='Ignore an existing checkpoint')
+        parser.add_argument(
+            '--clear', action='store_true', default=False,
+            help='Remove the content types from the index before a fresh '
+                 '(not resumed) run')
+        parser.add_argument(
+            '--using', default='default',
+            help='The search backend connection to use')
+
+    def handle(self, *args, **options):
+        content_types = options['content_types'] or CONTENT_TYPES.keys()
+        for ct in content_types:
+            if ct not in CONTENT_TYPES:
+                raise CommandError('Unknown content type: %s' % ct)
+
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = {}
+        if not options['restart'] and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                self.checkpoint = json.load(f)
+
+        if options['clear'] and not self.checkpoint:
+            haystack_connections[options['using']].get_backend().clear(
+                models=[CONTENT_TYPES[ct] for ct in content_types])
+
+        shards = []
+        for ct in content_types:
+            done = self.checkpoint.setdefault(ct, [])
+            for start, end in get_shards(
+                    ct, options['chunk_size'], options['using']):
+                if [start, end] not in done:
+                    shards.append((ct, start, end, options['using']))
+
+        verbose = options['verbosity'] > 1
+        if verbose:
+            print "Indexing %d ranges with %d workers" % (
+                len(shards), options['workers'])
+
+        started = time.time()
+        total = 0
+        if options['workers'] > 1:
+            close_connections()
+            pool = multiprocessing.Pool(
+                options['workers'], initializer=close_connections)
+            try:
+                for result in pool.imap_unordered(index_shard, shards):
+                    total += self.finish_shard(*result, verbose=verbose)
+                pool.close()
+            except BaseException:
+                # Including KeyboardInterrupt, so the workers don't linger
+                pool.terminate()
+                raise
+            finally:
+                pool.join()
+        else:
+            for shard in shards:
+                total += self.finish_shard(*index_shard(shard),
+                                           verbose=verbose)
+
+        invalidate(SEARCH)
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        if verbose:
+            print "Indexed %d resources in %.1fs" % (
+                total, time.time() - started)
+
+    def finish_shard(self, content_type, start, end, count, verbose=False):
+        """
+        Records a finished range in the checkpoint file, atomically.
+        """
+        self.checkpoint[content_type].append([start, end])
+        tmp_path = '%s.tmp' % self.checkpoint_path
+        with open(tmp_path, 'w') as f:
+            json.dump(self.checkpoint, f)
+        os.rename(tmp_path, self.checkpoint_path)
+        if verbose:
+            print "\t%s %d-%d: %d resources" % (
+                content_type, start, end, count)
+        return count
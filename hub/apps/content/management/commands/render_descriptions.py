@@ -0,0 +1,38 @@
+from hub.apps.content.models import ContentType
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = """Render the description html and excerpt of all resources, e.g.
+    after the markdown setup changed. New and edited resources are rendered
+    when they are saved.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of resources to update per transaction')
+
+    def handle(self, *args, **options):
+        # `update` instead of `save`, so the backfill leaves `modified`, the
+        # search index and the caches alone.
+        queryset = ContentType.objects.only('pk', 'description').order_by('pk')
+        last_pk = 0
+        count = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            with transaction.atomic():
+                for resource in batch:
+                    resource.render_description()
+                    ContentType.objects.filter(pk=resource.pk).update(
+                        description_html=resource.description_html,
+                        description_excerpt=resource.description_excerpt)
+            last_pk = batch[-1].pk
+            count += len(batch)
+            if options['verbosity'] > 1:
+                print "%d resources rendered" % count
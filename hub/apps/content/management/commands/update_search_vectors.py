@@ -0,0 +1,37 @@
+from hub.apps.content.fulltext import update_search_vectors
+from hub.apps.content.models import CONTENT_TYPES
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = """Build the Postgres search vectors of all published resources
+    of all (or the given) content types, see `content/fulltext.py`.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'content_types', nargs='*',
+            help='Content type keys to update, e.g. academicprogram. '
+                 'Defaults to all content types.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=250,
+            help='Number of resources per batch')
+
+    def handle(self, *args, **options):
+        content_types = options['content_types'] or CONTENT_TYPES.keys()
+        for ct in content_types:
+            if ct not in CONTENT_TYPES:
+                raise CommandError('Unknown content type: %s' % ct)
+
+        chunk_size = options['chunk_size']
+        for ct in content_types:
+            model = CONTENT_TYPES[ct]
+            pks = list(model.objects.filter(
+                status=model.STATUS_CHOICES.published
+            ).order_by('pk').values_list('pk', flat=True))
+            total = 0
+            for i in range(0, len(pks), chunk_size):
+                total += update_search_vectors(ct, pks[i:i + chunk_size])
+            if options['verbosity'] > 1:
+                print "%s: %d resources" % (ct, total)
@@ -0,0 +1,127 @@
+"""
+Map data for the content type browse pages.
+
+The map asks for the organizations of a content type's published resources
+as GeoJSON, for its current zoom level and bounds, see `MapApiView`.
+Organizations are clustered on a grid that gets finer with each zoom level:
+each cluster is a point at the (resource weighted) center of its
+organizations, with the number of resources and organizations in it.
+Clusters of a single organization link to its resources.
+
+The clusters of the whole world are cached per content type and zoom level,
+with the `content` generation; the bounds only pick from them.
+"""
+
+from __future__ import unicode_literals
+
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from ..browse.cache import CONTENT, versioned_key
+from .models import ContentType
+from .summary import BROWSE_LINK
+
+MAX_ZOOM = 21
+
+# Grid cells per 256px map tile, i.e. clusters are about 64px apart
+CELLS_PER_TILE = 4
+
+CLUSTERS_CACHE_KEY = 'map_clusters_{}_{}'
+
+
+def get_locations(ct_slug):
+    """
+    `(account_num, org_name, latitude, longitude, resource count)` of each
+    organization of the published resources of a content type.
+    """
+    return list(
+        ContentType.objects.published()
+        .filter(content_type=ct_slug,
+                organizations__location__isnull=False)
+        .values_list(
+            'organizations__account_num',
+            'organizations__org_name',
+            'organizations__location__latitude',
+            'organizations__location__longitude')
+        .annotate(count=Count('pk'))
+        .order_by())
+
+
+def build_clusters(ct_slug, zoom):
+    """
+    `[longitude, latitude, resource count, organization count, name, link]`
+    of each cluster. The name and link are only set for clusters of a single
+    organization.
+    """
+    size = 360.0 / (2 ** zoom * CELLS_PER_TILE)
+    cells = defaultdict(list)
+    for location in get_locations(ct_slug):
+        _, _, latitude, longitude, _ = location
+        cell = (int(math.floor((longitude + 180) / size)),
+                int(math.floor((latitude + 90) / size)))
+        cells[cell].append(location)
+
+    clusters = []
+    for locations in cells.values():
+        count = sum(location[4] for location in locations)
+        longitude = sum(loc[3] * loc[4] for loc in locations) / count
+        latitude = sum(loc[2] * loc[4] for loc in locations) / count
+        name = link = None
+        if len(locations) == 1:
+            account_num, name = locations[0][:2]
+            link = BROWSE_LINK.format(
+                ct=ct_slug, param='organizations', value=account_num)
+        clusters.append([
+            round(longitude, 5), round(latitude, 5), count, len(locations),
+            name, link])
+    return clusters
+
+
+def get_clusters(ct_slug, zoom):
+    key = versioned_key(CLUSTERS_CACHE_KEY.format(ct_slug, zoom), CONTENT)
+    clusters = cache.get(key)
+    if clusters is None:
+        clusters = build_clusters(ct_slug, zoom)
+        cache.set(key, clusters, settings.CACHE_TTL_VERSIONED)
+    return clusters
+
+
+def in_bounds(longitude, latitude, bounds):
+    west, south, east, north = bounds
+    if not south <= latitude <= north:
+        return False
+    if west <= east:
+        return west <= longitude <= east
+    # The bounds span the antimeridian
+    return longitude >= west or longitude <= east
+
+
+def get_map_data(ct_slug, zoom, bounds=None):
+    """
+    The clusters of a content type at a zoom level, within the optional
+    `(west, south, east, north)` bounds, as a GeoJSON feature collection.
+    """
+    zoom = max(0, min(zoom, MAX_ZOOM))
+    features = []
+    for longitude, latitude, count, organizations, name, link in (
+            get_clusters(ct_slug, zoom)):
+        if bounds and not in_bounds(longitude, latitude, bounds):
+            continue
+        features.append({
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [longitude, latitude],
+            },
+            'properties': {
+                'count': count,
+                'organizations': organizations,
+                'name': name,
+                'link': link,
+            },
+        })
+    return {'type': 'FeatureCollection', 'features': features}
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 09:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0087_auto_20190117_1956'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentTypeSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('content_type', models.CharField(max_length=40, unique=True)),
+                ('data', models.TextField(default='{}')),
+            ],
+            options={
+                'verbose_name': 'Content Type Summary',
+                'verbose_name_plural': 'Content Type Summaries',
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 11:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.template.defaultfilters import truncatewords_html
+from django_markup.markup import formatter
+
+# `models.DESCRIPTION_EXCERPT_WORDS` at the time of this migration
+DESCRIPTION_EXCERPT_WORDS = 30
+
+
+def render_descriptions(apps, schema_editor):
+    """
+    Renders the descriptions of the existing resources, like
+    `ContentType.render_description` and the `render_descriptions` command.
+    """
+    ContentType = apps.get_model('content', 'ContentType')
+    resources = ContentType.objects.exclude(description='').exclude(
+        description__isnull=True).values_list('pk', 'description')
+    for pk, description in resources.iterator():
+        description_html = formatter(description, filter_name='markdown')
+        ContentType.objects.filter(pk=pk).update(
+            description_html=description_html,
+            description_excerpt=truncatewords_html(
+                description_html, DESCRIPTION_EXCERPT_WORDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0088_contenttypesummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contenttype',
+            name='description_excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='contenttype',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_descriptions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 14:27
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def count_tags(apps, schema_editor):
+    Tag = apps.get_model('content', '_Tagulous_ContentType_keywords')
+    TagUsage = apps.get_model('content', 'TagUsage')
+    counts = (Tag.objects
+              .filter(contenttype__status='published')
+              .annotate(published_count=Count('contenttype'))
+              .values_list('pk', 'published_count'))
+    TagUsage.objects.bulk_create([
+        TagUsage(tag_id=pk, published_count=published_count)
+        for pk, published_count in counts
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0089_contenttype_description_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagUsage',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='content._Tagulous_ContentType_keywords')),
+                ('published_count', models.PositiveIntegerField(db_index=True, default=0)),
+            ],
+            options={
+                'verbose_name': 'Tag Usage',
+                'verbose_name_plural': 'Tag Usage',
+            },
+        ),
+        migrations.RunPython(count_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+INDEX_NAME = 'content_contenttype_search_vector'
+
+
+def add_search_vector(apps, schema_editor):
+    """
+    The weighted text search vector of each resource, and its GIN index, see
+    `content/fulltext.py`. Filled by the `update_search_vectors` command.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = schema_editor.quote_name(
+        apps.get_model('content', 'ContentType')._meta.db_table)
+    schema_editor.execute(
+        'ALTER TABLE {} ADD COLUMN "search_vector" tsvector'.format(table))
+    schema_editor.execute(
+        'CREATE INDEX {} ON {} USING gin ("search_vector")'.format(
+            INDEX_NAME, table))
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = schema_editor.quote_name(
+        apps.get_model('content', 'ContentType')._meta.db_table)
+    schema_editor.execute(
+        'ALTER TABLE {} DROP COLUMN IF EXISTS "search_vector"'.format(table))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0090_tagusage'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
@@ -7,25 +7,50 @@ from collections import OrderedDict
 import tagulous
 from urlparse import urlparse
 
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils import timezone
 from django.core.urlresolvers import reverse
+from django.template.defaultfilters import truncatewords_html
+from django_markup.markup import formatter
 from model_utils.models import TimeStampedModel
 from model_utils import Choices, FieldTracker
 from slugify import slugify
 from s3direct.fields import S3DirectField
 
 from .help import AFFIRMATION
+from ..metadata.models import Organization
 
 logger = getLogger(__name__)
 
+DESCRIPTION_EXCERPT_WORDS = 30
 
-class ContentTypeManager(models.Manager):
+
+class ContentTypeQuerySet(models.QuerySet):
     def published(self):
         return self.filter(status=self.model.STATUS_CHOICES.published)
 
+    def for_result_list(self):
+        """
+        Prefetches the images and organizations shown for each resource in
+        the browse result list (`browse/results/includes/item.html` and
+        `gallery_item.html`), limited to the columns these templates use.
+        Prefetching runs when a page is evaluated, so it only loads the
+        relations of the resources on that page.
+        """
+        images = Image.objects.only(
+            'ct', 'caption', 'image', 'small_thumbnail', 'med_thumbnail')
+        organizations = Organization.objects.only('org_name', 'state')
+        return self.prefetch_related(
+            models.Prefetch('images', queryset=images),
+            models.Prefetch('organizations', queryset=organizations),
+        )
+
+
+class ContentTypeManager(models.Manager.from_queryset(ContentTypeQuerySet)):
+    pass
+
 
 @python_2_unicode_compatible
 class ContentType(TimeStampedModel):
@@ -129,6 +154,11 @@ class ContentType(TimeStampedModel):
     date_submitted = models.DateField(
         null=True, auto_now_add=True, verbose_name='Date Submitted')
 
+    # The rendered `description`, kept up to date in `save`, so the result
+    # list and detail pages don't run markdown on each request.
+    description_html = models.TextField(blank=True, editable=False)
+    description_excerpt = models.TextField(blank=True, editable=False)
+
     status_tracker = FieldTracker(fields=['status'])
 
     objects = ContentTypeManager()
@@ -161,8 +191,20 @@ class ContentType(TimeStampedModel):
         if not self.slug:
             self.slug = slugify(self.title)
 
+        self.render_description()
+
         return super(ContentType, self).save(*args, **kwargs)
 
+    def render_description(self):
+        """
+        Renders the markdown `description` into `description_html`, and its
+        first words into `description_excerpt`.
+        """
+        self.description_html = formatter(
+            self.description or '', filter_name='markdown')
+        self.description_excerpt = truncatewords_html(
+            self.description_html, DESCRIPTION_EXCERPT_WORDS)
+
     def get_absolute_url(self):
         return reverse('browse:view', kwargs={'ct': self.content_type,
                                               'id': self.pk,
@@ -187,6 +229,17 @@ class ContentType(TimeStampedModel):
                     'verbose': settings.DEBUG},
                 countdown=15)
 
+    def refresh_summary(self):
+        """
+            Rebuilds the summary snapshot of this resource's content type,
+            once the current transaction is committed, so the task doesn't
+            summarize the old data
+        """
+        from .tasks import refresh_content_type_summary
+        content_type = self.content_type
+        transaction.on_commit(
+            lambda: refresh_content_type_summary.delay(content_type))
+
     def get_organization_list(self):
         return list(self.organizations.all())
 
@@ -298,6 +351,20 @@ class ContentType(TimeStampedModel):
         """
         return []
 
+    @classmethod
+    def ordering_options(cls):
+        """
+        Additional "Sort by" options for the browse view, as a list of
+        `(value, label, order_by)` tuples. `order_by` is a lookup relative to
+        `ContentType`, so it can span the join to the sub class, e.g.:
+
+            [('student_fee', 'Student Fee (largest)',
+              '-greenfund__student_fee')]
+
+        Resources without a value are sorted last.
+        """
+        return []
+
 
 @python_2_unicode_compatible
 class Author(TimeStampedModel):
@@ -395,6 +462,49 @@ class Image(TimeStampedModel):
         return self.ct.get_admin_url()
 
 
+@python_2_unicode_compatible
+class ContentTypeSummary(TimeStampedModel):
+    """
+    A materialized snapshot of the numbers shown on the summary tab of a
+    content type browse page: resource, organization and location counts,
+    and the bar chart data. The map loads its data separately, see `maps.py`.
+
+    The snapshot is stored as JSON and rebuilt whenever a resource of this
+    content type is published, edited or declined, see `summary.py`.
+    """
+    content_type = models.CharField(max_length=40, unique=True)
+    data = models.TextField(default='{}')
+
+    class Meta:
+        verbose_name = 'Content Type Summary'
+        verbose_name_plural = 'Content Type Summaries'
+
+    def __str__(self):
+        return self.content_type
+
+
+@python_2_unicode_compatible
+class TagUsage(models.Model):
+    """
+    The number of published resources tagged with a tag. Tag autocomplete
+    and the tag filter read it to offer only tags in use, most used first.
+
+    Kept up to date as resources are published, unpublished, deleted or
+    (re-)tagged, see `tags.py`.
+    """
+    tag = models.OneToOneField(
+        ContentType.keywords.tag_model, primary_key=True,
+        related_name='usage', on_delete=models.CASCADE)
+    published_count = models.PositiveIntegerField(default=0, db_index=True)
+
+    class Meta:
+        verbose_name = 'Tag Usage'
+        verbose_name_plural = 'Tag Usage'
+
+    def __str__(self):
+        return '{}: {}'.format(self.tag_id, self.published_count)
+
+
 # =============================================================================
 # Mapping of all available content types.
 #
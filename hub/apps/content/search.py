@@ -1,16 +1,110 @@
+from __future__ import unicode_literals
+
 from haystack import indexes
+from haystack.inputs import AutoQuery, Raw
+from haystack.query import SearchQuerySet
+
+# Query time weights of the text fields of `BaseIndex`, see `keyword_query`
+FIELD_WEIGHTS = (
+    ('title', 7),
+    ('tags', 3),
+    ('description', 3),
+    ('organization_names', 2),
+    ('text', 1),
+)
+
+
+def get_terms(keywords):
+    """
+    `(term, is_phrase, is_excluded)` of each term of `keywords`, following
+    the rules of haystack's `AutoQuery`: `"quoted words"` are a phrase, and
+    a `-keyword` excludes the hits with it.
+    """
+    phrases = AutoQuery.exact_match_re.findall(keywords)
+    for part in AutoQuery.exact_match_re.split(keywords):
+        if not part.strip():
+            continue
+        if part in phrases:
+            yield part, True, False
+            continue
+        for term in part.split():
+            if term.startswith('-') and len(term) > 1:
+                yield term[1:], False, True
+            else:
+                yield term, False, False
+
+
+def join_terms(terms):
+    """
+    The keywords of `get_terms` output, with normalized whitespace.
+    """
+    return ' '.join(
+        '"{}"'.format(' '.join(term.split())) if is_phrase else
+        '-{}'.format(term) if is_excluded else term
+        for term, is_phrase, is_excluded in terms)
+
+
+def keyword_query(keywords, sqs=None):
+    """
+    The hits for all of `keywords`, except those excluded with `-keyword`.
+    Each keyword or `"quoted phrase"` may match any of the text fields, and
+    the hits are scored by the `FIELD_WEIGHTS` of the fields they match in.
+    """
+    if sqs is None:
+        sqs = SearchQuerySet()
+    clauses = []
+    exclusions = []
+    for term, is_phrase, is_excluded in get_terms(keywords):
+        term = sqs.query.clean(term)
+        if is_phrase:
+            term = '"{}"'.format(term)
+        if is_excluded:
+            exclusions.append('NOT ({})'.format(' OR '.join(
+                '{}:{}'.format(field, term) for field, _ in FIELD_WEIGHTS)))
+        else:
+            clauses.append('({})'.format(' OR '.join(
+                '{}:{}^{}'.format(field, term, weight)
+                for field, weight in FIELD_WEIGHTS)))
+    if not clauses:
+        # Exclusions alone don't select any hits
+        return sqs.none()
+    return sqs.filter(content=Raw(' AND '.join(clauses + exclusions)))
 
 
 class BaseIndex(indexes.SearchIndex, indexes.Indexable):
     """
-    Base Haystack index class for each content type index. We don't use much
-    features of a search engine, we only index a blob of text, to search
-    against, and the actual content type primary key, which we later use to
-    filter down a queryset of content types.
+    Base Haystack index class for each content type index. The text to
+    search against is split into fields, weighted at query time (see
+    `keyword_query`): the title, description, tags and organization names,
+    and everything else in `text`, from the content type's index template.
+    We also index the actual content type primary key, which we later use
+    to filter down a queryset of content types.
+
+    The faceted fields mirror the browse filters, so the keyword browse can
+    filter and page inside the search backend, see `browse/search.py`.
+    Content type indexes add their own.
     """
     text = indexes.CharField(document=True, use_template=True)
+    title = indexes.CharField(model_attr='title')
+    description = indexes.CharField(model_attr='description', null=True)
+    tags = indexes.CharField()
+    organization_names = indexes.CharField()
     ct_pk = indexes.IntegerField()
 
+    # Relations used by the text templates and the prepare methods below
+    prefetch_fields = (
+        'keywords', 'organizations', 'topics', 'disciplines', 'authors')
+
+    content_type = indexes.CharField(model_attr='content_type', faceted=True)
+    permission = indexes.CharField(model_attr='permission', faceted=True)
+    topics = indexes.MultiValueField(faceted=True)
+    disciplines = indexes.MultiValueField(faceted=True)
+    organizations = indexes.MultiValueField(faceted=True)
+    country_iso = indexes.MultiValueField(faceted=True)
+    state = indexes.MultiValueField(faceted=True)
+    published_year = indexes.IntegerField(null=True, faceted=True)
+    date_created_year = indexes.IntegerField(null=True, faceted=True)
+
     def prepare_ct_pk(self, obj):
         """
         Save the actual primary key of the base content type object along the
@@ -20,9 +114,41 @@ class BaseIndex(indexes.SearchIndex, indexes.Indexable):
         ct_name = CONTENT_TYPES[obj.content_type]._meta.model_name.lower()
         return getattr(obj, ct_name).pk
 
+    def prepare_tags(self, obj):
+        return ' '.join(tag.name for tag in obj.keywords.all())
+
+    def prepare_organization_names(self, obj):
+        return ' '.join(
+            org.org_name for org in obj.organizations.all() if org.org_name)
+
+    def prepare_topics(self, obj):
+        return [topic.slug for topic in obj.topics.all()]
+
+    def prepare_disciplines(self, obj):
+        return [discipline.pk for discipline in obj.disciplines.all()]
+
+    def prepare_organizations(self, obj):
+        return [org.pk for org in obj.organizations.all()]
+
+    def prepare_country_iso(self, obj):
+        return sorted(set(
+            org.country_iso for org in obj.organizations.all()
+            if org.country_iso))
+
+    def prepare_state(self, obj):
+        return sorted(set(
+            org.state for org in obj.organizations.all() if org.state))
+
+    def prepare_published_year(self, obj):
+        return obj.published.year if obj.published else None
+
+    def prepare_date_created_year(self, obj):
+        return obj.date_created.year if obj.date_created else None
+
     def index_queryset(self, using=None):
         return self.get_model().objects.filter(
-            status=self.get_model().STATUS_CHOICES.published)
+            status=self.get_model().STATUS_CHOICES.published
+        ).prefetch_related(*self.prefetch_fields)
 
     def get_model(self):
         """
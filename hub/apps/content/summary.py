@@ -0,0 +1,183 @@
+from __future__ import unicode_literals
+
+import json
+from collections import OrderedDict
+from logging import getLogger
+
+from django.db.models import Count
+
+from .models import CONTENT_TYPES, ContentType, ContentTypeSummary
+
+logger = getLogger(__name__)
+
+# Lists of which content types get which bar charts on the summary tab
+TOPIC_GRAPH_ALLOWED = (
+    'Case Studies',
+    'Conference Presentations',
+    'Outreach Materials',
+    'Photographs',
+    'Publications',
+    'Tools',
+    'Videos & Webinars',
+)
+DISCIPLINE_GRAPH_ALLOWED = (
+    'Academic Programs',
+    'Case Studies',
+    'Course Materials',
+    'Publications',
+    'Research Centers & Institutes',
+)
+INSTALLATION_TYPE_GRAPH_ALLOWED = (
+    'Green Power Projects',
+)
+FUNDING_SOURCE_GRAPH_ALLOWED = (
+    'Green Funds',
+)
+
+BROWSE_LINK = '/browse/types/{ct}/?search=&content_type={ct}&{param}={value}' \
+    '&country=#resources-panel'
+BROWSE_LIST_LINK = '/browse/types/{ct}/?search=&gallery_view=list' \
+    '&content_type={ct}&country=&{param}={value}#resources-panel'
+
+
+def _facet_counts(qs, name_field, value_field, link):
+    """
+    Counts the resources in `qs` per related object, as a list of
+    `{name, count, link}` dicts, most used first.
+    """
+    rows = (qs.values(name_field, value_field)
+              .exclude(**{name_field: None})
+              .annotate(count=Count('id'))
+              .order_by('-count'))
+    return [
+        {
+            'name': row[name_field],
+            'count': row['count'],
+            'link': link(row[value_field]),
+        }
+        for row in rows
+    ]
+
+
+def build_summary(ct_slug):
+    """
+    Computes all summary tab numbers for the given content type.
+
+    Organization and location numbers are all derived from a single query
+    over the published resource/organization rows. Each bar chart
+    costs one additional grouped query, and only for the content types that
+    display it.
+    """
+    ct_class = CONTENT_TYPES[ct_slug]
+    label = ct_class.content_type_label()
+    qs = ContentType.objects.published().filter(content_type=ct_slug)
+
+    resources = set()
+    orgs = set()
+    countries = set()
+    states = set()
+    provinces = set()
+
+    rows = qs.values_list(
+        'pk',
+        'organizations__account_num',
+        'organizations__country',
+        'organizations__country_iso',
+        'organizations__state',
+    ).order_by()
+
+    for pk, account_num, country, iso, state in rows:
+        resources.add(pk)
+        if account_num is None:
+            continue
+        orgs.add(account_num)
+        if country:
+            countries.add(country)
+        if state and iso == 'US':
+            states.add(state)
+        elif state and iso == 'CA':
+            provinces.add(state)
+
+    def browse_link(param):
+        return lambda value: BROWSE_LINK.format(
+            ct=ct_slug, param=param, value=value)
+
+    summary = OrderedDict([
+        ('resource_count', len(resources)),
+        ('org_count', len(orgs)),
+        ('country_count', len(countries)),
+        ('state_count', len(states)),
+        ('province_count', len(provinces)),
+        ('topic_counts', None),
+        ('discipline_counts', None),
+        ('installation_counts', None),
+        ('funding_source_counts', None),
+    ])
+
+    if label in TOPIC_GRAPH_ALLOWED:
+        summary['topic_counts'] = _facet_counts(
+            qs, 'topics__name', 'topics__slug', browse_link('topics'))
+
+    if label in DISCIPLINE_GRAPH_ALLOWED:
+        summary['discipline_counts'] = _facet_counts(
+            qs, 'disciplines__name', 'disciplines__pk',
+            browse_link('discipline'))
+
+    if label in INSTALLATION_TYPE_GRAPH_ALLOWED:
+        summary['installation_counts'] = _facet_counts(
+            qs, 'greenpowerproject__installations__name',
+            'greenpowerproject__installations__pk',
+            browse_link('installation'))
+
+    if label in FUNDING_SOURCE_GRAPH_ALLOWED:
+        summary['funding_source_counts'] = _facet_counts(
+            qs, 'greenfund__funding_sources__name',
+            'greenfund__funding_sources__pk',
+            lambda value: BROWSE_LIST_LINK.format(
+                ct=ct_slug, param='funding_source', value=value))
+
+    return summary
+
+
+def refresh_summary(ct_slug):
+    """
+    Rebuilds and stores the summary snapshot for the given content type.
+    """
+    summary = build_summary(ct_slug)
+    ContentTypeSummary.objects.update_or_create(
+        content_type=ct_slug, defaults={'data': json.dumps(summary)})
+    return summary
+
+
+def get_summary(ct_slug):
+    """
+    Returns the stored summary snapshot for the given content type, building
+    it on first access.
+    """
+    try:
+        snapshot = ContentTypeSummary.objects.get(content_type=ct_slug)
+    except ContentTypeSummary.DoesNotExist:
+        return refresh_summary(ct_slug)
+    return json.loads(snapshot.data)
+
+
+def _utf8(value):
+    """
+    The chart data is rendered straight into javascript with the
+    `safe` filter, so strings have to be bytestrings to avoid `u''` literals.
+    """
+    if isinstance(value, dict):
+        return dict((_utf8(k), _utf8(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_utf8(v) for v in value]
+    if isinstance(value, unicode):
+        return value.encode('utf8')
+    return value
+
+
+def get_summary_context(ct_slug):
+    """
+    The summary snapshot, prepared for the summary tab templates.
+    """
+    return dict(
+        (key, _utf8(value)) for key, value in get_summary(ct_slug).items())
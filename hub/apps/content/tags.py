@@ -0,0 +1,127 @@
+"""
+Tag usage counts.
+
+`TagUsage` holds the number of published resources per tag. Rather than
+counting all tags on every autocomplete request, the counts of the tags a
+change touches are recomputed right away, in the same transaction:
+
+    - a resource is published or leaves the published state: its tags
+    - the tags of a published resource are added, removed or cleared: those
+      tags
+    - a published resource is deleted: its tags
+
+Each refresh is a single grouped count over the affected tags. The
+`rebuild_tag_usage` command rebuilds all counts.
+"""
+
+from __future__ import unicode_literals
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save, \
+    pre_delete
+
+from .models import ContentType, TagUsage
+
+Tag = ContentType.keywords.tag_model
+Tagging = ContentType._meta.get_field('keywords').remote_field.through
+
+
+def count_published(tag_pks=None):
+    """
+    `{tag pk: number of published resources}` of the given (or all) tags
+    with published resources.
+    """
+    qs = Tag.objects.filter(
+        contenttype__status=ContentType.STATUS_CHOICES.published)
+    if tag_pks is not None:
+        qs = qs.filter(pk__in=tag_pks)
+    return dict(qs.annotate(
+        published_count=Count('contenttype')).values_list(
+            'pk', 'published_count'))
+
+
+def refresh_tag_usage(tag_pks):
+    """
+    Recomputes the usage counts of the given tags.
+    """
+    tag_pks = set(tag_pks)
+    if not tag_pks:
+        return
+    counts = count_published(tag_pks)
+    for pk in tag_pks:
+        published_count = counts.get(pk, 0)
+        updated = TagUsage.objects.filter(tag_id=pk).update(
+            published_count=published_count)
+        if not updated and Tag.objects.filter(pk=pk).exists():
+            TagUsage.objects.create(tag_id=pk, published_count=published_count)
+
+
+def rebuild_tag_usage():
+    """
+    Recomputes the usage counts of all tags.
+    """
+    counts = count_published()
+    with transaction.atomic():
+        TagUsage.objects.all().delete()
+        TagUsage.objects.bulk_create([
+            TagUsage(tag_id=pk, published_count=published_count)
+            for pk, published_count in counts.items()
+        ])
+    return counts
+
+
+def get_tag_pks(resource):
+    return list(Tag.objects.filter(
+        contenttype__pk=resource.pk).values_list('pk', flat=True))
+
+
+def is_published(resource):
+    return resource.status == ContentType.STATUS_CHOICES.published
+
+
+def handle_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created or not isinstance(instance, ContentType):
+        # New resources don't have tags yet; they are counted as they
+        # are added
+        return
+    if instance.status_tracker.has_changed('status'):
+        refresh_tag_usage(get_tag_pks(instance))
+
+
+def handle_pre_delete(sender, instance, **kwargs):
+    if isinstance(instance, ContentType) and is_published(instance):
+        # The tags are gone once the resource is deleted
+        instance._usage_tag_pks = get_tag_pks(instance)
+
+
+def handle_post_delete(sender, instance, **kwargs):
+    refresh_tag_usage(getattr(instance, '_usage_tag_pks', []))
+
+
+def handle_keywords_changed(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if reverse:
+        # e.g. `tag.contenttype_set.add(...)`
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_tag_usage([instance.pk])
+        return
+
+    if not is_published(instance):
+        return
+    if action == 'pre_clear':
+        instance._usage_tag_pks = get_tag_pks(instance)
+    elif action == 'post_clear':
+        refresh_tag_usage(getattr(instance, '_usage_tag_pks', []))
+    elif action in ('post_add', 'post_remove'):
+        refresh_tag_usage(pk_set or [])
+
+
+def connect_signals():
+    post_save.connect(handle_save, dispatch_uid='tag_usage_save')
+    pre_delete.connect(handle_pre_delete, dispatch_uid='tag_usage_pre_delete')
+    post_delete.connect(
+        handle_post_delete, dispatch_uid='tag_usage_post_delete')
+    m2m_changed.connect(
+        handle_keywords_changed, sender=Tagging,
+        dispatch_uid='tag_usage_keywords_changed')
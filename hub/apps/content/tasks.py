@@ -1,10 +1,11 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django.utils.timezone import now
 from celery import shared_task
 from sorl.thumbnail import get_thumbnail
 
-from .models import Image
+from .models import ContentType, Image
 
 
 @shared_task(name='content.thumbnail_image')
@@ -43,3 +44,27 @@ def thumbnail_image(image_id, recreate=False, verbose=False):
             print "\t\t(%s)" % thmb.name
 
     image.save()
+
+    # New thumbnails are a new version of the resource's result row, see
+    # `cached_result_rows`
+    ContentType.objects.filter(pk=image.ct_id).update(modified=now())
+
+
+@shared_task(name='content.refresh_content_type_summary')
+def refresh_content_type_summary(content_type):
+    """
+        Rebuilds the summary snapshot for the given content type key, e.g.
+        `academicprogram`. See `summary.py`.
+    """
+    from .summary import refresh_summary
+    refresh_summary(content_type)
+
+
+@shared_task(name='content.update_search_index')
+def update_search_index(items, queued_at=None):
+    """
+        Updates the search index for a batch of `[pk, content_type]` pairs,
+        as queued by `indexing.QueuedSignalProcessor`.
+    """
+    from .indexing import update_index
+    update_index(items, queued_at)
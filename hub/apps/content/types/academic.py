@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 from model_utils import Choices
 
 from ...metadata.models import ProgramType, SustainabilityTopic
@@ -80,5 +81,8 @@ class AcademicProgram(ContentType):
 
 
 class AcademicProgramIndex(BaseIndex):
+    program_type = indexes.IntegerField(
+        model_attr='program_type_id', null=True, faceted=True)
+
     def get_model(self):
         return AcademicProgram
@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 from model_utils import Choices
 
 from ...metadata.models import SustainabilityTopic, CourseMaterialType
@@ -61,5 +62,10 @@ class Material(ContentType):
 
 
 class MaterialIndex(BaseIndex):
+    material_type = indexes.IntegerField(
+        model_attr='material_type_id', null=True, faceted=True)
+    course_level = indexes.CharField(
+        model_attr='course_level', null=True, faceted=True)
+
     def get_model(self):
         return Material
@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 
 from hub.apps.metadata.models import SustainabilityTopic
 from ..models import ContentType, ContentTypeManager
@@ -83,7 +84,27 @@ class GreenFund(ContentType):
         from ...browse.filterset import GreenFundFilterSet
         return GreenFundFilterSet
 
+    @classmethod
+    def ordering_options(cls):
+        return [
+            ('student_fee', 'Student Fee (largest)',
+             '-greenfund__student_fee'),
+            ('annual_budget', 'Annual Budget (largest)',
+             '-greenfund__annual_budget'),
+        ]
+
 
 class GreenFundIndex(BaseIndex):
+    prefetch_fields = BaseIndex.prefetch_fields + ('funding_sources',)
+    student_fee = indexes.IntegerField(model_attr='student_fee', null=True)
+    annual_budget = indexes.IntegerField(
+        model_attr='annual_budget', null=True)
+    funding_sources = indexes.MultiValueField(faceted=True)
+    revolving_fund = indexes.CharField(
+        model_attr='revolving_fund', null=True, faceted=True)
+
+    def prepare_funding_sources(self, obj):
+        return [source.name for source in obj.funding_sources.all()]
+
     def get_model(self):
         return GreenFund
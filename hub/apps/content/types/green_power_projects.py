@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 
 from hub.apps.browse.forms import LeanSelectMultiple
 from hub.apps.metadata.models import SustainabilityTopic
@@ -99,6 +100,13 @@ class GreenPowerProject(ContentType):
         from ...browse.filterset import GreenPowerBrowseFilterSet
         return GreenPowerBrowseFilterSet
 
+    @classmethod
+    def ordering_options(cls):
+        return [
+            ('greenpowerproject', 'Project Size',
+             '-greenpowerproject__project_size'),
+        ]
+
     @classmethod
     def label_overrides(cls):
         return {
@@ -148,5 +156,14 @@ class GreenPowerProject(ContentType):
 
 
 class GreenPowerProjectIndex(BaseIndex):
+    prefetch_fields = BaseIndex.prefetch_fields + ('installations',)
+    project_size = indexes.FloatField(model_attr='project_size')
+    installations = indexes.MultiValueField(faceted=True)
+    ownership_type = indexes.CharField(
+        model_attr='ownership_type', faceted=True)
+
+    def prepare_installations(self, obj):
+        return [installation.pk for installation in obj.installations.all()]
+
     def get_model(self):
         return GreenPowerProject
@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 from model_utils import Choices
 
 from ..models import ContentType, ContentTypeManager
@@ -55,5 +56,8 @@ class Presentation(ContentType):
 
 
 class PresentationIndex(BaseIndex):
+    conf_name = indexes.IntegerField(
+        model_attr='conf_name_id', null=True, faceted=True)
+
     def get_model(self):
         return Presentation
@@ -1,4 +1,5 @@
 from django.db import models
+from haystack import indexes
 from model_utils import Choices
 
 from ..models import ContentType, ContentTypeManager
@@ -60,5 +61,8 @@ class Publication(ContentType):
 
 
 class PublicationIndex(BaseIndex):
+    material_type = indexes.IntegerField(
+        model_attr='material_type_id', null=True, faceted=True)
+
     def get_model(self):
         return Publication
@@ -35,6 +35,15 @@ class OrganizationAdmin(admin.ModelAdmin):
         return False
 
 
+class FeedAdmin(admin.ModelAdmin):
+    """Feeds are maintained by the `metadata.refresh_feeds` task."""
+    list_display = ('url', 'fetched', 'error')
+    readonly_fields = ('url', 'etag', 'last_modified', 'fetched', 'error')
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(models.SustainabilityTopic, SustainabilityTopicAdmin)
 admin.site.register(models.AcademicDiscipline)
 admin.site.register(models.InstitutionalOffice)
@@ -46,3 +55,4 @@ admin.site.register(models.CourseMaterialType)
 admin.site.register(models.OutreachMaterialType)
 admin.site.register(models.PublicationMaterialType)
 admin.site.register(models.FundingSource)
+admin.site.register(models.Feed, FeedAdmin)
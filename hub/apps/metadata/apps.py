@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+from ..browse.cache import METADATA, invalidate_on_commit
+
+
+def invalidate_metadata_caches(sender, **kwargs):
+    invalidate_on_commit(METADATA)
 
 
 class MetadataConfig(AppConfig):
     name = 'hub.apps.metadata'
     verbose_name = 'Metadata for Content Types'
+
+    def ready(self):
+        """
+        Any change to a topic, discipline etc. retires the cached filter
+        choices and pages that list them. Organizations are left out; they
+        are synced from ISS in bulk and only show up through resources.
+        """
+        from .models import MetadataBaseModel
+        for model in self.get_models():
+            if issubclass(model, MetadataBaseModel):
+                post_save.connect(
+                    invalidate_metadata_caches, sender=model,
+                    dispatch_uid='invalidate_metadata_caches_save')
+                post_delete.connect(
+                    invalidate_metadata_caches, sender=model,
+                    dispatch_uid='invalidate_metadata_caches_delete')
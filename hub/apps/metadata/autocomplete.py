@@ -0,0 +1,143 @@
+"""
+Organization autocomplete.
+
+Matches are ranked: names starting with the keyword first, then names with a
+word starting with it, then any other names containing it, each group
+alphabetically. At most `limit` matches are returned.
+
+Two engines, picked with the `ORGANIZATION_AUTOCOMPLETE` setting:
+
+    - `database`: ranks and limits in Postgres. `icontains` is served by the
+      trigram index on the organization name (metadata migration 0026).
+    - `memory`: a sorted word index of all organizations, held in the
+      process and searched with bisection. Only matches prefixes and word
+      starts. Suits small deployments without `pg_trgm`; reloaded after
+      `ORGANIZATION_AUTOCOMPLETE_TTL` seconds.
+"""
+
+from __future__ import unicode_literals
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import Organization
+
+RANK_PREFIX = 0
+RANK_WORD_START = 1
+RANK_CONTAINS = 2
+
+
+def get_rank(name, keyword):
+    """
+    The rank of `name` for the (lower case) `keyword`, or None if it
+    doesn't match.
+    """
+    name = name.lower()
+    if name.startswith(keyword):
+        return RANK_PREFIX
+    if ' {}'.format(keyword) in name:
+        return RANK_WORD_START
+    if keyword in name:
+        return RANK_CONTAINS
+    return None
+
+
+class DatabaseEngine(object):
+    def search(self, keyword, limit):
+        rank = Case(
+            When(org_name__istartswith=keyword, then=Value(RANK_PREFIX)),
+            When(org_name__icontains=' {}'.format(keyword),
+                 then=Value(RANK_WORD_START)),
+            default=Value(RANK_CONTAINS),
+            output_field=IntegerField())
+        qs = (Organization.objects
+              .filter(org_name__icontains=keyword)
+              .annotate(rank=rank)
+              .order_by('rank', 'org_name')
+              .values_list('pk', 'org_name', 'state'))
+        return list(qs[:limit])
+
+
+class MemoryEngine(object):
+    """
+    Keeps `(word, position)` pairs of all organization names in a sorted
+    list. The organizations with a word starting with the keyword's first
+    word sit next to each other, and are found with a binary search.
+    """
+    def __init__(self):
+        self.ttl = settings.ORGANIZATION_AUTOCOMPLETE_TTL
+        self.lock = threading.Lock()
+        self.loaded_at = None
+
+    def load(self):
+        organizations = list(Organization.objects.order_by(
+            'org_name').values_list('pk', 'org_name', 'state'))
+        words = sorted(
+            (word, position)
+            for position, (_, name, _) in enumerate(organizations)
+            for word in set((name or '').lower().split()))
+        self.organizations = organizations
+        self.words = words
+        self.loaded_at = time.time()
+
+    def ensure_loaded(self):
+        with self.lock:
+            if (
+                self.loaded_at is None or
+                (self.ttl and time.time() - self.loaded_at > self.ttl)
+            ):
+                self.load()
+            return self.organizations, self.words
+
+    def search(self, keyword, limit):
+        organizations, words = self.ensure_loaded()
+        first_word = keyword.split()[0] if keyword.split() else keyword
+
+        positions = set()
+        i = bisect_left(words, (first_word,))
+        while i < len(words) and words[i][0].startswith(first_word):
+            positions.add(words[i][1])
+            i += 1
+
+        matches = []
+        for position in positions:
+            org = organizations[position]
+            rank = get_rank(org[1] or '', keyword)
+            if rank is not None:
+                matches.append((rank, position))
+        # Positions follow the name order
+        matches.sort()
+        return [organizations[position] for _, position in matches[:limit]]
+
+
+ENGINES = {
+    'database': DatabaseEngine,
+    'memory': MemoryEngine,
+}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        engine_class = ENGINES[settings.ORGANIZATION_AUTOCOMPLETE]
+        if not isinstance(_engine, engine_class):
+            _engine = engine_class()
+        return _engine
+
+
+def search_organizations(keyword, limit):
+    """
+    `(pk, org_name, state)` of the best `limit` organizations matching
+    `keyword`, see the module docstring.
+    """
+    keyword = ' '.join(keyword.lower().split())
+    if not keyword:
+        return []
+    return get_engine().search(keyword, limit)
@@ -0,0 +1,146 @@
+"""
+Topic feed ingestion.
+
+The news (`rss_feed`) and partner (`scpd_rss_feed`) feeds of the topics are
+fetched in the background, by the periodic `metadata.refresh_feeds` task,
+and their entries stored as `FeedEntry`s. Topic pages only read the stored
+entries, so a slow or broken feed never holds up a request.
+
+All feeds are fetched concurrently, with a timeout, and conditionally: the
+`ETag` and `Last-Modified` headers of the last response are sent along, and
+an unchanged feed (`304 Not Modified`) keeps its entries. A failed fetch
+keeps them as well, and records the error on the `Feed`. So does a feed
+whose entries can't be stored; the other feeds are stored regardless.
+
+Changed entries bump the `feeds` cache generation, which only keys the topic
+pages and tabs that list them.
+"""
+
+from __future__ import unicode_literals
+
+from logging import getLogger
+from multiprocessing.pool import ThreadPool
+
+import feedparser
+import requests
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils.timezone import now
+
+from ..browse.cache import FEEDS, invalidate
+from .models import Feed, FeedEntry, SustainabilityTopic
+
+logger = getLogger(__name__)
+
+ENTRY_FIELDS = ('title', 'link', 'description', 'logo', 'location', 'level')
+
+
+def get_feed_urls():
+    urls = set()
+    for rss_feed, scpd_rss_feed in SustainabilityTopic.objects.values_list(
+            'rss_feed', 'scpd_rss_feed'):
+        urls.update(url for url in (rss_feed, scpd_rss_feed) if url)
+    return urls
+
+
+def fetch(feed):
+    """
+    Fetches a feed. Returns `(feed, response, error)`; runs in the fetch
+    threads, so it doesn't touch the database.
+    """
+    headers = {}
+    if feed.etag:
+        headers['If-None-Match'] = feed.etag
+    if feed.last_modified:
+        headers['If-Modified-Since'] = feed.last_modified
+    try:
+        response = requests.get(
+            feed.url, headers=headers, timeout=settings.FEED_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        return feed, None, e
+    return feed, response, None
+
+
+def get_entry(feed, position, entry):
+    values = dict(
+        (field, entry.get(field) or '') for field in ENTRY_FIELDS)
+    if not values['description']:
+        values['description'] = entry.get('summary') or ''
+    for field in ('link', 'logo'):
+        # Dropped rather than truncated, which would break the URL
+        if len(values[field]) > FeedEntry._meta.get_field(field).max_length:
+            values[field] = ''
+    values['location'] = values['location'][:255]
+    values['level'] = values['level'][:255]
+    return FeedEntry(feed=feed, position=position, **values)
+
+
+def store(feed, response, error):
+    """
+    Stores the outcome of a fetch. Returns whether the entries changed.
+    """
+    feed.fetched = now()
+    if error is not None:
+        logger.error('Feed fetch failed; {}: {}'.format(feed.url, error))
+        feed.error = '{}'.format(error)
+        feed.save()
+        return False
+
+    feed.error = ''
+    if response.status_code == 304:
+        feed.save()
+        return False
+
+    parsed = feedparser.parse(response.content)
+    if parsed.bozo and not parsed.entries:
+        logger.error('Feed parse failed; {}'.format(feed.url))
+        feed.error = '{}'.format(parsed.get('bozo_exception', 'Invalid feed'))
+        feed.save()
+        return False
+
+    try:
+        with transaction.atomic():
+            feed.etag = response.headers.get('ETag', '')[:255]
+            feed.last_modified = response.headers.get(
+                'Last-Modified', '')[:64]
+            feed.save()
+            feed.entries.all().delete()
+            FeedEntry.objects.bulk_create([
+                get_entry(feed, position, entry)
+                for position, entry in enumerate(
+                    parsed.entries[:settings.FEED_MAX_ENTRIES])
+            ])
+    except DatabaseError as e:
+        logger.error('Feed store failed; {}: {}'.format(feed.url, e))
+        # Keeps the old entries, and the headers they were fetched with
+        Feed.objects.filter(pk=feed.pk).update(
+            fetched=feed.fetched, error='{}'.format(e))
+        return False
+    return True
+
+
+def refresh_feeds(urls=None):
+    """
+    Fetches the given (or all topic) feeds and stores their entries. Returns
+    the number of feeds whose entries changed.
+    """
+    if urls is None:
+        urls = get_feed_urls()
+        # Feeds no topic uses anymore
+        Feed.objects.exclude(url__in=urls).delete()
+    feeds = [Feed.objects.get_or_create(url=url)[0] for url in set(urls)]
+    if not feeds:
+        return 0
+
+    pool = ThreadPool(min(len(feeds), settings.FEED_CONCURRENCY))
+    try:
+        results = pool.map(fetch, feeds)
+    finally:
+        pool.close()
+        pool.join()
+
+    changed = sum(store(*result) for result in results)
+    if changed:
+        invalidate(FEEDS)
+    return changed
@@ -0,0 +1,14 @@
+from hub.apps.metadata.feeds import refresh_feeds
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = """Fetch the news and partner feeds of all topics and store their
+    entries
+    """
+
+    def handle(self, *args, **options):
+        changed = refresh_feeds()
+        if options['verbosity'] > 1:
+            print "%d feeds changed" % changed
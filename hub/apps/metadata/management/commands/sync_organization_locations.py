@@ -0,0 +1,15 @@
+from hub.apps.metadata.models import sync_locations
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = """Parse the ISS coordinates of all organizations into numbers
+    for the browse maps. Runs periodically, see `CELERYBEAT_SCHEDULE`; run
+    it to update the maps right after syncing organizations from ISS.
+    """
+
+    def handle(self, *args, **options):
+        count = sync_locations()
+        if options['verbosity'] > 1:
+            print "%d organizations with a location" % count
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+INDEX_NAME = 'metadata_organization_name_trgm'
+
+
+def create_index(apps, schema_editor):
+    """
+    A trigram index on the upper case organization name, which serves the
+    `org_name__icontains` lookups of the organization autocomplete (Django
+    compiles them to `UPPER("org_name"::text) LIKE UPPER(...)`).
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('iss', 'Organization')._meta.db_table
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX {} ON {} USING gin '
+        '(UPPER("org_name"::text) gin_trgm_ops)'.format(
+            INDEX_NAME, schema_editor.quote_name(table)))
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS {}'.format(INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metadata', '0025_fundingsource'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 16:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_locations(apps, schema_editor):
+    """
+    Same as `metadata.models.sync_locations`.
+    """
+    ISSOrganization = apps.get_model('iss', 'Organization')
+    OrganizationLocation = apps.get_model('metadata', 'OrganizationLocation')
+    locations = []
+    for pk, latitude, longitude in ISSOrganization.objects.exclude(
+            latitude='').values_list('pk', 'latitude', 'longitude'):
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            continue
+        if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+            locations.append(OrganizationLocation(
+                organization_id=pk, latitude=latitude, longitude=longitude))
+    OrganizationLocation.objects.bulk_create(locations)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('metadata', '0026_organization_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationLocation',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='location', serialize=False, to='metadata.Organization')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'Organization Location',
+            },
+        ),
+        migrations.RunPython(fill_locations, migrations.RunPython.noop),
+    ]
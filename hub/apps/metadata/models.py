@@ -2,17 +2,16 @@ from __future__ import unicode_literals
 
 from logging import getLogger
 
-from django.db import models
+from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.core.urlresolvers import reverse
-from django.core.cache import cache
-from django.conf import settings
 
-import feedparser
 from model_utils.models import TimeStampedModel
 from model_utils import Choices
 from iss.models import Organization as ISSOrganization
 
+from ..browse.cache import CONTENT, invalidate_on_commit
+
 logger = getLogger(__name__)
 
 
@@ -61,28 +60,62 @@ class SustainabilityTopic(MetadataBaseModel):
 
     def get_rss_items(self):
         """
-        Fetch, parse and cache rss items
+        The latest stored entries of the news feed, see `feeds.py`
         """
         if not self.rss_feed:
             return None
+        return get_feed_entries(self.rss_feed)[:20]
 
-        CACHE_KEY = 'TOPIC_FEED_ITEMS_{}'.format(self.slug.upper())
+    def get_partner_entries(self):
+        """
+        The stored entries of the partners feed, see `feeds.py`
+        """
+        if not self.scpd_rss_feed:
+            return None
+        return get_feed_entries(self.scpd_rss_feed)
 
-        entries = cache.get(CACHE_KEY)
 
-        if entries:
-            return entries
+@python_2_unicode_compatible
+class Feed(models.Model):
+    """
+    An RSS feed of a topic, as last fetched by `feeds.refresh_feeds`. The
+    `etag` and `last_modified` headers make the next fetch conditional.
+    """
+    url = models.URLField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    fetched = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
 
-        try:
-            feed = feedparser.parse(self.rss_feed)
-        except Exception as e:  # Any error is bad here, catch all.
-            logger.error('Feed parse failed; {}'.format(self.rss_feed))
-            logger.exception(e)
-            return None
+    def __str__(self):
+        return self.url
+
+
+@python_2_unicode_compatible
+class FeedEntry(models.Model):
+    """
+    An entry of a feed, in feed order. `logo`, `location` and `level` are
+    only set by the partner feeds.
+    """
+    feed = models.ForeignKey(Feed, related_name='entries')
+    position = models.PositiveIntegerField()
+    title = models.TextField(blank=True)
+    link = models.URLField(max_length=1000, blank=True)
+    description = models.TextField(blank=True)
+    logo = models.URLField(max_length=1000, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    level = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ('feed', 'position')
+        verbose_name_plural = 'Feed Entries'
+
+    def __str__(self):
+        return self.title
 
-        entries = feed.entries[:20]
-        cache.set(CACHE_KEY, entries, settings.CACHE_TTL_LONG)
-        return entries
+
+def get_feed_entries(url):
+    return list(FeedEntry.objects.filter(feed__url=url))
 
 
 @python_2_unicode_compatible
@@ -202,6 +235,72 @@ class Organization(ISSOrganization):
             return self.org_name
 
 
+@python_2_unicode_compatible
+class OrganizationLocation(models.Model):
+    """
+    The coordinates of an organization, as numbers, for the browse maps.
+    ISS keeps them as text, so they are parsed once, when organizations are
+    synced, see `sync_locations`.
+    """
+    organization = models.OneToOneField(
+        Organization, primary_key=True, related_name='location',
+        on_delete=models.CASCADE)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+
+    class Meta:
+        verbose_name = 'Organization Location'
+
+    def __str__(self):
+        return '{}, {}'.format(self.latitude, self.longitude)
+
+
+def parse_coordinates(latitude, longitude):
+    """
+    The `(latitude, longitude)` floats of ISS coordinates, or None if they
+    are missing or invalid.
+    """
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def sync_locations():
+    """
+    Rebuilds the `OrganizationLocation`s from the ISS coordinates, if they
+    changed, and retires the map clusters cached with the `content`
+    generation. Returns the number of organizations with a valid location.
+    Scheduled by `CELERYBEAT_SCHEDULE`, so organizations added or moved by
+    the ISS sync show up on the maps.
+    """
+    locations = {}
+    for pk, latitude, longitude in ISSOrganization.objects.exclude(
+            latitude='').values_list('pk', 'latitude', 'longitude'):
+        coordinates = parse_coordinates(latitude, longitude)
+        if coordinates is not None:
+            locations[pk] = coordinates
+
+    current = dict(
+        (pk, (latitude, longitude))
+        for pk, latitude, longitude in OrganizationLocation.objects
+        .values_list('organization_id', 'latitude', 'longitude'))
+    if locations == current:
+        return len(locations)
+
+    with transaction.atomic():
+        OrganizationLocation.objects.all().delete()
+        OrganizationLocation.objects.bulk_create([
+            OrganizationLocation(
+                organization_id=pk, latitude=latitude, longitude=longitude)
+            for pk, (latitude, longitude) in locations.items()])
+        invalidate_on_commit(CONTENT)
+    return len(locations)
+
+
 class GreenPowerInstallation(MetadataBaseModel):
     class Meta:
         ordering = ('name', )
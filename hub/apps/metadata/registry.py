@@ -0,0 +1,104 @@
+"""
+A process local registry of the small metadata tables: topics, disciplines,
+offices, program types and so on.
+
+Each table is loaded once per process into an immutable `MetadataTable`,
+and indexed by pk, slug and name. The registry follows the `metadata` cache
+generation, which is bumped whenever a metadata object is saved or deleted
+(see `MetadataConfig.ready`), and reloads the tables once it changed. A
+lookup costs a single cache read and no queries.
+"""
+
+from __future__ import unicode_literals
+
+import threading
+
+from ..browse.cache import METADATA, get_generation
+
+
+class MetadataTable(object):
+    """
+    All objects of a metadata model, in their default order.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.items = tuple(model.objects.all())
+        self.by_pk = dict((obj.pk, obj) for obj in self.items)
+        self.by_name = dict((obj.name, obj) for obj in self.items)
+        self.by_slug = dict(
+            (getattr(obj, 'slug', None), obj) for obj in self.items)
+        self._choices = {}
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, pk=None, slug=None, name=None):
+        """
+        The object with the given pk, slug or name, or None.
+        """
+        if pk is not None:
+            return self.by_pk.get(int(pk))
+        if slug is not None:
+            return self.by_slug.get(slug)
+        return self.by_name.get(name)
+
+    def choices(self, value_field='pk', label_field='name'):
+        key = (value_field, label_field)
+        if key not in self._choices:
+            self._choices[key] = tuple(
+                (getattr(obj, value_field), getattr(obj, label_field))
+                for obj in self.items)
+        return self._choices[key]
+
+
+class MetadataRegistry(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.tables = {}
+
+    def get_table(self, model):
+        generation = get_generation(METADATA)
+        if generation is None:
+            # No shared cache (e.g. the dummy backend) to tell us about
+            # changes, so don't keep anything around
+            return MetadataTable(model)
+
+        with self.lock:
+            if generation != self.generation:
+                self.generation = generation
+                self.tables = {}
+            tables = self.tables
+
+        table = tables.get(model)
+        if table is None:
+            # Loaded outside the lock; two threads may both load the table,
+            # which is harmless
+            table = tables[model] = MetadataTable(model)
+        return table
+
+    def clear(self):
+        with self.lock:
+            self.generation = None
+            self.tables = {}
+
+
+registry = MetadataRegistry()
+
+
+def get_metadata(model):
+    """
+    The current `MetadataTable` of a metadata model.
+    """
+    return registry.get_table(model)
+
+
+def metadata_choices(model, value_field='pk', label_field='name'):
+    """
+    Choices of a metadata model, for a form field. Evaluated each time the
+    choices are used, so they follow metadata changes.
+    """
+    return lambda: get_metadata(model).choices(value_field, label_field)
@@ -0,0 +1,23 @@
+from __future__ import absolute_import
+
+from celery import shared_task
+
+
+@shared_task(name='metadata.refresh_feeds')
+def refresh_feeds():
+    """
+        Fetches the news and partner feeds of all topics and stores their
+        entries. Scheduled by `CELERYBEAT_SCHEDULE`, see `feeds.py`.
+    """
+    from .feeds import refresh_feeds
+    refresh_feeds()
+
+
+@shared_task(name='metadata.sync_organization_locations')
+def sync_organization_locations():
+    """
+        Parses the coordinates of organizations added or moved by the ISS
+        sync for the browse maps. Scheduled by `CELERYBEAT_SCHEDULE`.
+    """
+    from .models import sync_locations
+    sync_locations()
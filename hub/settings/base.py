@@ -2,6 +2,7 @@
 import os
 import sys
 import re
+from datetime import timedelta
 
 # Import global settings to make it easier to extend settings.
 from django.conf.global_settings import *   # pylint: disable=W0614,W0401  # NOQA
@@ -234,6 +235,29 @@ HAYSTACK_CONNECTIONS = {
     },
 }
 HAYSTACK_DEFAULT_OPERATOR = 'AND'
+HAYSTACK_SIGNAL_PROCESSOR = 'hub.apps.content.indexing.QueuedSignalProcessor'
+# Where keyword searches run: 'haystack' (the connections above) or
+# 'postgres' (the search vectors of `content/fulltext.py`; run
+# `update_search_vectors` before enabling)
+KEYWORD_SEARCH_BACKEND = os.environ.get('KEYWORD_SEARCH_BACKEND', 'haystack')
+# Seconds to wait for further changes before indexing a changed resource
+SEARCH_INDEX_DEBOUNCE = 10
+
+# Page, count and filter keyword searches in the search index, rather than in
+# the database. Requires an index built with the faceted fields of
+# `BaseIndex`, so run `rebuild_index` before enabling.
+SEARCH_BACKED_BROWSE = os.environ.get('SEARCH_BACKED_BROWSE', '0') == '1'
+
+# Page browse results sorted by date posted or title with a cursor instead of
+# a page number, and cache their total, see `browse/pagination.py`.
+BROWSE_KEYSET_PAGINATION = (
+    os.environ.get('BROWSE_KEYSET_PAGINATION', '0') == '1')
+
+# Organization autocomplete engine, `database` or `memory`, see
+# `hub/apps/metadata/autocomplete.py`
+ORGANIZATION_AUTOCOMPLETE = os.environ.get(
+    'ORGANIZATION_AUTOCOMPLETE', 'database')
+ORGANIZATION_AUTOCOMPLETE_TTL = 60 * 60
 
 # Debug Toolbar
 DEBUG_TOOLBAR = os.environ.get('DEBUG_TOOLBAR', False)
@@ -243,6 +267,8 @@ if DEBUG_TOOLBAR:
 # Cache lifetime in seconds
 CACHE_TTL_SHORT = 60 * 10  # 10 minutes
 CACHE_TTL_LONG = 60 * 60 * 12  # 12 hours
+# Values keyed with a cache generation, see `browse/cache.py`
+CACHE_TTL_VERSIONED = 60 * 60 * 24 * 7  # 7 days
 
 import django_cache_url
 CACHE_URL = os.environ.get('CACHE_URL', 'dummy://')
@@ -364,5 +390,20 @@ CELERY_ACCEPT_CONTENT = ['json', ]
 CELERY_TASK_SERIALIZER = 'json'
 # No backend needed right now, since we're not storing results
 # CELERY_RESULT_BACKEND = os.environ.get('CELERY_BACKEND_URL', None)
+CELERYBEAT_SCHEDULE = {
+    'refresh-feeds': {
+        'task': 'metadata.refresh_feeds',
+        'schedule': timedelta(minutes=30),
+    },
+    'sync-organization-locations': {
+        'task': 'metadata.sync_organization_locations',
+        'schedule': timedelta(hours=1),
+    },
+}
+
+# Topic feeds, see `metadata/feeds.py`
+FEED_TIMEOUT = 10  # seconds
+FEED_CONCURRENCY = 8
+FEED_MAX_ENTRIES = 100
 
 GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY', None)
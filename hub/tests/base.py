@@ -1,13 +1,26 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.core import management
+from django.db import connection
 
 from django_membersuite_auth.models import MemberSuitePortalUser
 
+from ..apps.browse.cache import SEARCH, invalidate
+
 
 User = get_user_model()
 
 
+def run_commit_hooks():
+    """
+    Runs the `transaction.on_commit` callbacks registered so far. A
+    `TestCase` never commits its transaction, so they wouldn't run at all.
+    """
+    callbacks, connection.run_on_commit = connection.run_on_commit, []
+    for _, callback in callbacks:
+        callback()
+
+
 class WithUserSuperuserTestCase(TestCase):
     """
     Some base models/structure to create before doing actual tests.
@@ -59,6 +72,8 @@ class BaseSearchBackendTestCase(TestCase):
         """
         management.call_command('rebuild_index', verbosity=0,
                                 interactive=False)
+        # Retire search hits cached before the rebuild
+        invalidate(SEARCH)
 
 
 # The kwargs required for `create` for each content type
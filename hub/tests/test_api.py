@@ -1,10 +1,16 @@
 from json import loads
 
-from django.test import TestCase
+import django_cache_url
+from mock import patch
+
+from django.test import TestCase, override_settings
 from django.core.urlresolvers import reverse
 
-from ..apps.metadata.models import Organization
-from ..apps.content.models import AcademicProgram
+from ..apps.browse.cache import CONTENT, get_generation
+from ..apps.api.views import OrganizationsApiView, TagsApiView
+from ..apps.metadata.models import Organization, sync_locations
+from ..apps.content.models import AcademicProgram, TagUsage
+from ..apps.content.tags import rebuild_tag_usage
 
 
 class BaseApiTestCase(TestCase):
@@ -76,6 +82,34 @@ class OrganizationsApiTestCase(BaseApiTestCase):
         self.assertTrue('org_name' in data[0])
         self.assertTrue('state' in data[0])
 
+    @patch.object(OrganizationsApiView, 'cache', False)
+    def test_ranking_and_limit(self):
+        """
+        Name prefixes rank before word starts before other matches, and no
+        more than `max_num_results` are returned
+        """
+        Organization.objects.create(
+            account_num=4, org_name='Yorkshire College', state='',
+            exclude_from_website='0')
+        Organization.objects.create(
+            account_num=5, org_name='Newyorker Institute', state='',
+            exclude_from_website='0')
+
+        for engine in ('database', 'memory'):
+            with override_settings(ORGANIZATION_AUTOCOMPLETE=engine):
+                data = loads(self._get_response('york').content)
+                names = [match['org_name'] for match in data]
+                expected = [
+                    'Yorkshire College, ', 'Los York, CA', 'New York, NY']
+                if engine == 'database':
+                    # Only the database matches within words
+                    expected.append('Newyorker Institute, ')
+                self.assertEqual(names, expected)
+
+                with patch.object(OrganizationsApiView, 'max_num_results', 2):
+                    data = loads(self._get_response('york').content)
+                    self.assertEqual(len(data), 2)
+
 
 class KeywordsApiTestCase(BaseApiTestCase):
     """
@@ -111,3 +145,137 @@ class KeywordsApiTestCase(BaseApiTestCase):
         self.assertEqual(response.status_code, 200)
         data = loads(response.content)
         self.assertEqual(len(data), 0)
+
+    def _get_usage(self, name):
+        return TagUsage.objects.get(tag__name=name).published_count
+
+    @patch.object(TagsApiView, 'cache', False)
+    def test_ranking(self):
+        """
+        Tags are ranked by the number of published resources using them
+        """
+        published = AcademicProgram.STATUS_CHOICES.published
+        for title in ('First', 'Second'):
+            resource = AcademicProgram.objects.create(
+                title=title, status=published)
+            resource.keywords.add('pie')
+        AcademicProgram.objects.create(title='New').keywords.add('pizza')
+
+        data = loads(self._get_response('pi').content)
+        self.assertEqual([tag['name'] for tag in data], ['pie', 'pizza'])
+
+        with patch.object(TagsApiView, 'max_num_results', 1):
+            data = loads(self._get_response('pi').content)
+            self.assertEqual(len(data), 1)
+
+    def test_usage_counts(self):
+        """
+        Usage counts follow publishing, tagging and deletes
+        """
+        self.assertEqual(self._get_usage('pizza'), 1)
+
+        other = AcademicProgram.objects.create(title='Other')
+        other.keywords.add('pizza')
+        self.assertEqual(self._get_usage('pizza'), 1)
+
+        other.status = AcademicProgram.STATUS_CHOICES.published
+        other.save()
+        self.assertEqual(self._get_usage('pizza'), 2)
+
+        self.ap.keywords.remove('pizza')
+        self.assertEqual(self._get_usage('pizza'), 1)
+
+        other.delete()
+        self.assertFalse(TagUsage.objects.filter(
+            tag__name='pizza', published_count__gt=0).exists())
+
+        self.ap.keywords.add('pizza', 'pasta')
+        TagUsage.objects.all().delete()
+        rebuild_tag_usage()
+        self.assertEqual(self._get_usage('pizza'), 1)
+        self.assertEqual(self._get_usage('pasta'), 1)
+
+
+@override_settings(CACHES={
+    'default': django_cache_url.parse('locmem://hub_test')})
+class MapApiTestCase(TestCase):
+    """
+    Test the clustered map data API.
+    """
+    def setUp(self):
+        self.api_url = reverse('api:map', kwargs={'ct': 'academicprogram'})
+        coordinates = (
+            (1, 'Seattle College', '47.6', '-122.3'),
+            (2, 'Tacoma College', '47.3', '-122.4'),
+            (3, 'Boston College', '42.3', '-71.1'),
+            (4, 'Nowhere College', 'n/a', ''),
+        )
+        orgs = [
+            Organization.objects.create(
+                account_num=pk, org_name=name, latitude=lat, longitude=lng,
+                exclude_from_website='0')
+            for pk, name, lat, lng in coordinates]
+        self.assertEqual(sync_locations(), 3)
+
+        published = AcademicProgram.STATUS_CHOICES.published
+        for title, resource_orgs in (('First', orgs), ('Second', orgs[:1])):
+            resource = AcademicProgram.objects.create(
+                title=title, status=published)
+            resource.organizations.add(*resource_orgs)
+        AcademicProgram.objects.create(title='New').organizations.add(orgs[2])
+
+    def _get_features(self, **params):
+        response = self.client.get(self.api_url, params)
+        self.assertEqual(response.status_code, 200)
+        data = loads(response.content)
+        self.assertEqual(data['type'], 'FeatureCollection')
+        return [feature['properties'] for feature in data['features']]
+
+    def test_clusters(self):
+        """
+        Organizations close to each other are clustered at low zoom levels
+        """
+        features = sorted(self._get_features(zoom=2), key=lambda f: f['count'])
+        self.assertEqual(len(features), 2)
+        self.assertEqual(features[0]['name'], 'Boston College')
+        self.assertEqual(features[0]['count'], 1)
+        self.assertIn('organizations=3', features[0]['link'])
+        self.assertEqual(features[1]['organizations'], 2)
+        self.assertEqual(features[1]['count'], 3)
+        self.assertIsNone(features[1]['name'])
+
+        features = self._get_features(zoom=10)
+        self.assertEqual(
+            sorted(f['name'] for f in features),
+            ['Boston College', 'Seattle College', 'Tacoma College'])
+
+    def test_location_changes(self):
+        """
+        The clusters follow organizations that moved, and are only retired
+        when a location changed
+        """
+        self.assertEqual(len(self._get_features(zoom=10)), 3)
+        generation = get_generation(CONTENT)
+        self.assertEqual(sync_locations(), 3)
+        self.assertEqual(get_generation(CONTENT), generation)
+
+        Organization.objects.filter(account_num=4).update(
+            latitude='41.9', longitude='-87.6')
+        self.assertEqual(sync_locations(), 4)
+        self.assertNotEqual(get_generation(CONTENT), generation)
+        self.assertIn(
+            'Nowhere College',
+            [f['name'] for f in self._get_features(zoom=10)])
+
+    def test_bounds(self):
+        features = self._get_features(zoom=10, bbox='-125,47.5,-120,50')
+        self.assertEqual([f['name'] for f in features], ['Seattle College'])
+
+    def test_invalid_parameters(self):
+        response = self.client.get(self.api_url, {'zoom': 'far'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.api_url, {'bbox': '1,2,3'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            reverse('api:map', kwargs={'ct': 'unknown'}))
+        self.assertEqual(response.status_code, 404)
@@ -1,16 +1,30 @@
 from __future__ import unicode_literals
 
+import django_cache_url
+from mock import patch
+
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.http import QueryDict
+from django.template.loader import render_to_string
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
 
 from ..apps.access.models import TemporaryUser
-from ..apps.browse.templatetags.browse_tags import permission_flag, mask_url
-from ..apps.content.models import ContentType
+from ..apps.browse.cache import METADATA, invalidate
+from ..apps.browse.pagination import encode_cursor
+from ..apps.browse.templatetags.browse_tags import cached_result_rows, \
+    permission_flag, mask_url
+from ..apps.browse.views import BrowseView
+from ..apps.content.models import ContentType, Image
 from ..apps.content.types.academic import AcademicProgram
-from ..apps.metadata.models import SustainabilityTopic
+from ..apps.metadata.models import Organization, SustainabilityTopic
 from .base import WithUserSuperuserTestCase
-from datetime import date
+from datetime import date, timedelta
 
 
 class ContentTypePermissionTestCase(WithUserSuperuserTestCase):
@@ -316,6 +330,143 @@ class BrowsePermissionTestCase(WithUserSuperuserTestCase):
         self.assertEqual(response.status_code, 200)
 
 
+@override_settings(CACHES={'default': django_cache_url.parse('dummy://')})
+class BrowseQueryCountTestCase(WithUserSuperuserTestCase):
+    """
+    The images and organizations of a result page are prefetched, so the
+    number of queries doesn't grow with the page size.
+    """
+    def setUp(self):
+        for i in range(6):
+            resource = AcademicProgram.objects.create(
+                title='Resource {}'.format(i),
+                status=ContentType.STATUS_CHOICES.published,
+                permission=ContentType.PERMISSION_CHOICES.open)
+            Image.objects.create(
+                ct=resource, caption='Image {}'.format(i),
+                image='http://testserver/image.jpg')
+            resource.organizations.add(Organization.objects.create(
+                account_num=i + 1, org_name='Organization {}'.format(i),
+                exclude_from_website=0))
+        self.url = reverse('browse:browse', kwargs={'ct': 'academicprogram'})
+        return super(BrowseQueryCountTestCase, self).setUp()
+
+    def get_query_count(self, paginate_by, **params):
+        with patch.object(BrowseView, 'paginate_by', paginate_by):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(response.context['object_list']), paginate_by)
+        return len(queries)
+
+    def test_query_count_is_independent_of_page_size(self):
+        self.assertEqual(self.get_query_count(2), self.get_query_count(6))
+
+    def test_gallery_query_count_is_independent_of_page_size(self):
+        self.assertEqual(
+            self.get_query_count(2, gallery_view='gallery'),
+            self.get_query_count(6, gallery_view='gallery'))
+
+
+@override_settings(CACHES={
+    'default': django_cache_url.parse('locmem://hub_test')})
+class CachedResultRowsTestCase(WithUserSuperuserTestCase):
+    """
+    Result rows are rendered once per resource version, the lock icon is
+    added per user.
+    """
+    def setUp(self):
+        caches['default'].clear()
+        self.resource = AcademicProgram.objects.create(
+            title='Cached Row Resource',
+            description='Some *markdown*',
+            status=ContentType.STATUS_CHOICES.published,
+            permission=ContentType.PERMISSION_CHOICES.login)
+        return super(CachedResultRowsTestCase, self).setUp()
+
+    def get_row(self, user):
+        return cached_result_rows(
+            {'user': user}, [self.resource], 'item')[0]
+
+    @patch('hub.apps.browse.templatetags.browse_tags.render_to_string',
+           wraps=render_to_string)
+    def test_rows_are_cached_per_version(self, render):
+        row = self.get_row(AnonymousUser())
+        self.assertIn('Cached Row Resource', row)
+        self.assertIn('<em>markdown</em>', row)
+        self.assertIn('fa-lock', row)
+        self.assertEqual(render.call_count, 1)
+
+        # Same version: served from cache, with the superuser's (empty) flag
+        row = self.get_row(self.superuser)
+        self.assertNotIn('fa-lock', row)
+        self.assertEqual(render.call_count, 1)
+
+        self.resource.title = 'Renamed Row Resource'
+        self.resource.save()
+        self.assertIn('Renamed Row Resource', self.get_row(AnonymousUser()))
+        self.assertEqual(render.call_count, 2)
+
+        # Related objects, like topics, change with the generations
+        invalidate(METADATA)
+        self.get_row(AnonymousUser())
+        self.assertEqual(render.call_count, 3)
+
+
+@override_settings(
+    BROWSE_KEYSET_PAGINATION=True,
+    CACHES={'default': django_cache_url.parse('dummy://')})
+class KeysetPaginationTestCase(WithUserSuperuserTestCase):
+    """
+    Date posted and title sorted results are paged with a cursor.
+    """
+    def setUp(self):
+        published = now()
+        titles = ['Echo', 'Alpha', 'Delta', 'Bravo', 'Bravo']
+        for i, title in enumerate(titles):
+            AcademicProgram.objects.create(
+                title=title,
+                status=ContentType.STATUS_CHOICES.published,
+                # the last two share their date posted
+                published=published - timedelta(days=min(i, 3)))
+        self.url = reverse('browse:browse', kwargs={'ct': 'academicprogram'})
+        return super(KeysetPaginationTestCase, self).setUp()
+
+    def get_all_pages(self, **params):
+        pks = []
+        with patch.object(BrowseView, 'paginate_by', 2):
+            while True:
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['paginator'].count, 5)
+                pks += [obj.pk for obj in response.context['object_list']]
+                if 'next_page_query' not in response.context:
+                    return pks
+                params = QueryDict(response.context['next_page_query'])
+
+    def test_keyset_pagination(self):
+        published = ContentType.objects.published()
+        self.assertEqual(
+            self.get_all_pages(),
+            list(published.order_by('-published', '-pk')
+                          .values_list('pk', flat=True)))
+        self.assertEqual(
+            self.get_all_pages(order='title'),
+            list(published.order_by('title', 'pk')
+                          .values_list('pk', flat=True)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+        # Well formed, but no date posted
+        for value in (123, '2017-13-01T00:00:00'):
+            response = self.client.get(
+                self.url, {'cursor': encode_cursor(value, 1)})
+            self.assertEqual(response.status_code, 404)
+
+
 class MaskUrlTagTestCase(WithUserSuperuserTestCase):
     """
         Test that the mask_url template tag is mutating strings as we wish
@@ -1,13 +1,20 @@
+import django_cache_url
 from django.contrib.auth.models import User
 from django.core import mail
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.test import override_settings
 from django_webtest import WebTest
 
+from ..apps.browse.cache import CONTENT, get_generation
 from ..apps.content.types.videos import Video
 from ..apps.content.types.casestudies import CaseStudy
 from ..apps.content.models import Website
+from ..apps.content.summary import build_summary, get_summary
 from ..apps.metadata.models import (Organization,
                                     SustainabilityTopic,
                                     InstitutionalOffice)
+from .base import run_commit_hooks
 
 
 class AdminTestCase(WebTest):
@@ -59,6 +66,68 @@ class AdminTestCase(WebTest):
         self.assertEqual(1, len(mail.outbox))
         self.assertIn('declined', mail.outbox[0].subject.lower())
 
+    def test_summary_is_refreshed_upon_status_change(self):
+        self.assertEqual(get_summary('video')['resource_count'], 0)
+
+        self._post_resource('published')
+        # The summary is refreshed once the admin's changes are committed
+        self.assertEqual(get_summary('video')['resource_count'], 0)
+        run_commit_hooks()
+        summary = get_summary('video')
+        self.assertEqual(summary['resource_count'], 1)
+        self.assertEqual(summary['org_count'], 1)
+
+        self._post_resource('declined')
+        run_commit_hooks()
+        self.assertEqual(get_summary('video')['resource_count'], 0)
+
+    @override_settings(CACHES={
+        'default': django_cache_url.parse('locmem://hub_test')})
+    def test_bulk_delete_refreshes_the_summary(self):
+        self._post_resource('published')
+        run_commit_hooks()
+        self.assertEqual(get_summary('video')['resource_count'], 1)
+        generation = get_generation(CONTENT)
+
+        response = self.app.get(
+            reverse('admin:content_contenttype_changelist'),
+            user=self.superuser.username)
+        form = response.forms['changelist-form']
+        form['action'] = 'delete_selected'
+        form.get('_selected_action', index=0).checked = True
+        # Confirmed on a second page
+        form.submit().form.submit()
+        run_commit_hooks()
+
+        self.assertFalse(Video.objects.exists())
+        self.assertNotEqual(get_generation(CONTENT), generation)
+        self.assertEqual(get_summary('video')['resource_count'], 0)
+
+    def test_build_summary(self):
+        org = Organization.objects.create(account_num=2,
+                                          org_name='Sample College',
+                                          country='United States',
+                                          country_iso='US',
+                                          state='WA',
+                                          latitude='47.6',
+                                          longitude='-122.3',
+                                          exclude_from_website=0)
+        self.resource.organizations.add(org)
+        self.resource.status = 'published'
+        self.resource.save()
+
+        summary = build_summary('video')
+        self.assertEqual(summary['resource_count'], 1)
+        self.assertEqual(summary['org_count'], 2)
+        self.assertEqual(summary['country_count'], 1)
+        self.assertEqual(summary['state_count'], 1)
+        self.assertEqual(summary['province_count'], 0)
+        self.assertEqual(summary['topic_counts'][0]['name'], 'Science')
+        self.assertEqual(summary['topic_counts'][0]['count'], 1)
+        self.assertIsNone(summary['discipline_counts'])
+        # The map loads its data from the map API
+        self.assertNotIn('map_data', summary)
+
     def test_case_study_date_fields(self):
         case_study = CaseStudy.objects.create(content_type='casestudy',
                                               status='new',
@@ -72,3 +141,19 @@ class AdminTestCase(WebTest):
         case_study.status = case_study.STATUS_CHOICES.published
         case_study.save()
         self.assertEqual(case_study.published, case_study.date_created)
+
+    def test_description_is_rendered_on_save(self):
+        self.resource.description = 'Some *markdown* ' + 'word ' * 40
+        self.resource.save()
+        self.assertIn('<em>markdown</em>', self.resource.description_html)
+        self.assertIn('<em>markdown</em>', self.resource.description_excerpt)
+        self.assertTrue(self.resource.description_excerpt.endswith(
+            '...</p>'))
+
+    def test_render_descriptions_command(self):
+        Video.objects.filter(pk=self.resource.pk).update(
+            description='*Backfilled*', description_html='')
+        call_command('render_descriptions', batch_size=1)
+        resource = Video.objects.get(pk=self.resource.pk)
+        self.assertIn('<em>Backfilled</em>', resource.description_html)
+        self.assertEqual(resource.modified, self.resource.modified)
@@ -1,5 +1,10 @@
+import datetime
+
+from mock import patch
+from django.core.exceptions import ValidationError
 from django.utils.timezone import now
 from django.conf import settings
+from django.test import override_settings
 from django.core.urlresolvers import reverse
 
 from ..apps.metadata.models import Organization, SustainabilityTopic, \
@@ -8,7 +13,11 @@ from ..apps.content.types.academic import AcademicProgram
 from ..apps.content.types.photographs import Photograph
 from ..apps.content.types.publications import Publication
 from ..apps.content.types.green_funds import GreenFund
-from ..apps.content.models import CONTENT_TYPES, Image
+from ..apps.browse.search import SearchPaginator
+from ..apps.browse.views import BrowseView
+from ..apps.browse.filter import CreatedFilter, OrderingFilter, \
+    OrganizationFilter, PublishedFilter, SearchFilter, TagFilter, TopicFilter
+from ..apps.content.models import CONTENT_TYPES, ContentType, Image
 from .base import (
     BaseSearchBackendTestCase,
     WithUserSuperuserTestCase,
@@ -158,6 +167,294 @@ class SpecificFilterTestCase(WithUserSuperuserTestCase, BaseSearchBackendTestCas
             self.assertEqual(response.status_code, 200)
             self.assertEqual(len(response.context['object_list']), 1)
 
+    def test_range_bucket_filter(self):
+        """
+        Range buckets are half open and can be combined
+        """
+        st = SustainabilityTopic.objects.create(name='Blah', slug='blah')
+        fs = FundingSource.objects.create(name='Junk')
+        for budget in (250000, 750000, 1000000):
+            gf = GreenFund.objects.create(
+                title='Fund {}'.format(budget),
+                description='blah',
+                published=now(),
+                status=GreenFund.STATUS_CHOICES.published,
+                revolving_fund='Yes',
+                annual_budget=budget,
+            )
+            gf.topics.add(st)
+            gf.funding_sources.add(fs)
+
+        _url = reverse('browse:browse', kwargs={'ct': 'greenfund'})
+        self.client.login(**self.superuser_cred)
+
+        response = self.client.get(
+            _url, {'annual_budget': ['100000to499999']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['object_list']), 1)
+
+        response = self.client.get(
+            _url, {'annual_budget': ['500000to999999', 'gte1000000']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['object_list']), 2)
+
+    def test_content_type_ordering(self):
+        """
+        Content types can declare their own sort options, which sort on the
+        sub class fields in the database, without a value last
+        """
+        st = SustainabilityTopic.objects.create(name='Blah', slug='blah')
+        fs = FundingSource.objects.create(name='Junk')
+        for budget in (250000, None, 750000):
+            gf = GreenFund.objects.create(
+                title='Fund {}'.format(budget),
+                description='blah',
+                published=now(),
+                status=GreenFund.STATUS_CHOICES.published,
+                revolving_fund='Yes',
+                annual_budget=budget,
+            )
+            gf.topics.add(st)
+            gf.funding_sources.add(fs)
+
+        _url = reverse('browse:browse', kwargs={'ct': 'greenfund'})
+        self.client.login(**self.superuser_cred)
+
+        response = self.client.get(_url, {'order': 'annual_budget'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [ct.title for ct in response.context['object_list']],
+            ['Fund 750000', 'Fund 250000', 'Fund None'])
+
+    def test_search_max_hits(self):
+        """
+        Keyword searches fetch no more than `max_hits` hits, and are sorted
+        by relevance without an `order` value
+        """
+        for i in range(3):
+            AcademicProgram.objects.create(
+                title='Energy Program {}'.format(i),
+                status=AcademicProgram.STATUS_CHOICES.published)
+        self._rebuild_index()
+
+        search = SearchFilter()
+        qs = search.filter(ContentType.objects.published(), 'energy')
+        self.assertEqual(qs.count(), 3)
+
+        search.max_hits = 2
+        qs = search.filter(ContentType.objects.published(), 'energy')
+        self.assertEqual(qs.count(), 2)
+
+        ordered = OrderingFilter().filter(qs, '')
+        self.assertEqual(
+            [ct.pk for ct in ordered], list(qs.__result_ids__))
+
+    @override_settings(SEARCH_BACKED_BROWSE=False)
+    def test_filtered_search_max_hits(self):
+        """
+        Only keyword searches without other filters cap their hits; a
+        filtered match ranked past the cap is still found
+        """
+        topic = SustainabilityTopic.objects.create(
+            name='Energy', slug='energy')
+        for i in range(3):
+            AcademicProgram.objects.create(
+                title='Energy Energy Program {}'.format(i),
+                status=AcademicProgram.STATUS_CHOICES.published)
+        ranked_last = AcademicProgram.objects.create(
+            title='Solar Program',
+            description='Some energy',
+            status=AcademicProgram.STATUS_CHOICES.published)
+        ranked_last.topics.add(topic)
+        self._rebuild_index()
+
+        _url = reverse('browse:browse')
+        self.client.login(**self.superuser_cred)
+
+        with patch.object(BrowseView, 'search_max_hits', 2), \
+                patch.object(BrowseView, 'paginate_by', 1):
+            response = self.client.get(_url, {
+                'search': 'energy', 'topics': ['energy']})
+            self.assertEqual(
+                [ct.pk for ct in response.context['object_list']],
+                [ranked_last.pk])
+
+            # The cap doesn't depend on the page
+            for page in ('1', '2'):
+                response = self.client.get(_url, {
+                    'search': 'energy', 'page': page})
+                self.assertEqual(response.context['paginator'].count, 2)
+
+    @override_settings(SEARCH_BACKED_BROWSE=True)
+    def test_search_backed_browse(self):
+        """
+        Keyword searches with simple filters are paged in the search index,
+        others fall back to the database
+        """
+        topic = SustainabilityTopic.objects.create(
+            name='Energy', slug='energy')
+        for i in range(3):
+            ct = AcademicProgram.objects.create(
+                title='Energy Program {}'.format(i),
+                status=AcademicProgram.STATUS_CHOICES.published)
+            if i:
+                ct.topics.add(topic)
+        self._rebuild_index()
+
+        _url = reverse('browse:browse')
+        self.client.login(**self.superuser_cred)
+
+        response = self.client.get(_url, {
+            'search': 'energy',
+            'content_type': ['academicprogram'],
+            'topics': ['energy'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context['paginator'], SearchPaginator)
+        self.assertEqual(response.context['paginator'].count, 2)
+        self.assertEqual(
+            sorted(ct.title for ct in response.context['object_list']),
+            ['Energy Program 1', 'Energy Program 2'])
+
+        response = self.client.get(_url, {
+            'search': 'energy',
+            'topics': ['energy'],
+            'size': ['lt_5000'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIsInstance(
+            response.context['paginator'], SearchPaginator)
+
+    @override_settings(SEARCH_BACKED_BROWSE=True)
+    def test_search_backed_range_filter(self):
+        """
+        Range buckets of content type indexes are filtered in the search
+        index too
+        """
+        st = SustainabilityTopic.objects.create(name='Blah', slug='blah')
+        fs = FundingSource.objects.create(name='Donations (Alumni)')
+        for budget in (250000, 750000):
+            gf = GreenFund.objects.create(
+                title='Energy Fund {}'.format(budget),
+                description='blah',
+                published=now(),
+                status=GreenFund.STATUS_CHOICES.published,
+                revolving_fund='Yes',
+                annual_budget=budget,
+            )
+            gf.topics.add(st)
+            gf.funding_sources.add(fs)
+        self._rebuild_index()
+
+        _url = reverse('browse:browse', kwargs={'ct': 'greenfund'})
+        self.client.login(**self.superuser_cred)
+
+        response = self.client.get(_url, {
+            'search': 'energy',
+            'annual_budget': ['100000to499999'],
+            'funding_source': ['Donations (Alumni)'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context['paginator'], SearchPaginator)
+        self.assertEqual(
+            [ct.title for ct in response.context['object_list']],
+            ['Energy Fund 250000'])
+
+    def test_year_choices(self):
+        """
+        Year choices only list the years with resources of the given content
+        type, with the number of resources per year
+        """
+        for year in (2010, 2012, 2012):
+            AcademicProgram.objects.create(
+                title='Academic Program {}'.format(year),
+                date_created=datetime.date(year, 6, 1),
+                status=AcademicProgram.STATUS_CHOICES.published)
+        Publication.objects.create(
+            title='Publication',
+            date_created=datetime.date(2015, 6, 1),
+            status=Publication.STATUS_CHOICES.published)
+
+        self.assertEqual(
+            list(CreatedFilter(AcademicProgram).field.choices),
+            [(2012, '2012 (2)'), (2010, '2010 (1)')])
+        self.assertEqual(
+            list(CreatedFilter(Publication).field.choices),
+            [(2015, '2015 (1)')])
+        self.assertEqual(
+            list(PublishedFilter().field.choices),
+            [(now().year, '{} (4)'.format(now().year))])
+
+    def test_m2m_filters_need_no_distinct(self):
+        """
+        M2M filters match in subqueries, so a resource matching several
+        selected values is listed once, without a DISTINCT
+        """
+        topics = [
+            SustainabilityTopic.objects.create(name=name, slug=name)
+            for name in ('energy', 'water')]
+        orgs = [
+            Organization.objects.create(
+                account_num=pk, org_name='Org {}'.format(pk),
+                exclude_from_website=0)
+            for pk in (1, 2)]
+        published = AcademicProgram.STATUS_CHOICES.published
+        resource = AcademicProgram.objects.create(
+            title='Both Topics', status=published)
+        resource.topics.add(*topics)
+        resource.organizations.add(*orgs)
+        resource.keywords.add('tag1', 'tag2')
+        other = AcademicProgram.objects.create(
+            title='One Tag', status=published)
+        other.topics.add(topics[0])
+        other.keywords.add('tag1')
+
+        qs = ContentType.objects.published()
+        qs = TopicFilter().filter(qs, [t.slug for t in topics])
+        qs = OrganizationFilter().filter(qs, [o.pk for o in orgs])
+        qs = TagFilter().filter(qs, ['tag1', 'tag2'])
+        self.assertEqual([ct.pk for ct in qs], [resource.pk])
+        self.assertNotIn('DISTINCT', '{}'.format(qs.query))
+
+    def test_lean_choice_filters(self):
+        """
+        Organization and tag filters only look up the submitted values
+        """
+        org = Organization.objects.create(
+            account_num=1, org_name='Selected Org', exclude_from_website=0)
+        Organization.objects.create(
+            account_num=2, org_name='Other Org', exclude_from_website=0)
+
+        field = OrganizationFilter().field
+        self.assertEqual(field.clean([str(org.pk)]), [str(org.pk)])
+        with self.assertRaises(ValidationError):
+            field.clean(['999'])
+        # Not a pk at all
+        with self.assertRaises(ValidationError):
+            field.clean(['abc'])
+        self.client.login(**self.superuser_cred)
+        response = self.client.get(
+            reverse('browse:browse'), {'organizations': 'abc'})
+        self.assertEqual(response.status_code, 200)
+
+        rendered = field.widget.render('organizations', [org.pk])
+        self.assertIn('Selected Org', rendered)
+        self.assertNotIn('Other Org', rendered)
+
+        resource = AcademicProgram.objects.create(
+            title='Tagged', status=AcademicProgram.STATUS_CHOICES.published)
+        resource.keywords.add('tag1')
+        AcademicProgram.objects.create(title='Unpublished').keywords.add(
+            'unpublished-tag')
+        field = TagFilter().field
+        with self.assertNumQueries(1):
+            self.assertEqual(field.clean(['tag1']), ['tag1'])
+        with self.assertRaises(ValidationError):
+            field.clean(['missing-tag'])
+        # Only tags of published resources are offered
+        with self.assertRaises(ValidationError):
+            field.clean(['unpublished-tag'])
+
 
 class TestGalleryView(WithUserSuperuserTestCase, BaseSearchBackendTestCase):
     """
@@ -1,6 +1,19 @@
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
 from unittest import TestCase
 
-from ..apps.metadata.models import Organization
+import django_cache_url
+from mock import patch
+from django.core.cache import caches
+from django.db import DataError
+from django.test import TestCase as DjangoTestCase, override_settings
+
+from ..apps.browse.cache import FEEDS, METADATA, get_generation, \
+    get_generations
+from ..apps.metadata.feeds import get_entry, refresh_feeds
+from ..apps.metadata.models import Feed, FeedEntry, Organization, \
+    SustainabilityTopic
+from ..apps.metadata.registry import get_metadata, registry
 
 
 class OrganizationProxyTestCase(TestCase):
@@ -36,3 +49,138 @@ class OrganizationProxyTestCase(TestCase):
         self.assertNotIn(self.org1, org_list)
         self.assertIn(self.org2, org_list)
         self.assertIn(self.org3, org_list)
+
+
+@override_settings(CACHES={
+    'default': django_cache_url.parse('locmem://hub_test')})
+class MetadataRegistryTestCase(DjangoTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        registry.clear()
+        self.topic = SustainabilityTopic.objects.create(
+            name='Energy', slug='energy')
+
+    def test_lookups_are_served_from_the_process(self):
+        get_metadata(SustainabilityTopic)
+        with self.assertNumQueries(0):
+            topics = get_metadata(SustainabilityTopic)
+            self.assertEqual(topics.get(slug='energy'), self.topic)
+            self.assertEqual(topics.get(pk=self.topic.pk), self.topic)
+            self.assertEqual(topics.get(name='Energy'), self.topic)
+            self.assertEqual(
+                topics.choices('slug'), (('energy', 'Energy'),))
+
+    def test_metadata_changes_reload_the_tables(self):
+        self.assertEqual(len(get_metadata(SustainabilityTopic)), 1)
+        SustainabilityTopic.objects.create(name='Water', slug='water')
+        self.assertEqual(len(get_metadata(SustainabilityTopic)), 2)
+        self.assertIsNone(
+            get_metadata(SustainabilityTopic).get(slug='missing'))
+
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>News</title>
+<item><title>First News</title><link>http://example.com/1/</link></item>
+<item><title>Second News</title><link>http://example.com/2/</link></item>
+</channel></rss>"""
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """
+    A local stand-in for the feed servers: serves `FEED` with an ETag, and
+    answers `304 Not Modified` for that ETag.
+    """
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == '/broken/':
+            self.send_response(500)
+            self.end_headers()
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            self.wfile.write(FEED)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(CACHES={
+    'default': django_cache_url.parse('locmem://hub_test')})
+class FeedRefreshTestCase(DjangoTestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), FeedHandler)
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = 'http://127.0.0.1:{}/'.format(self.server.server_port)
+        self.topic = SustainabilityTopic.objects.create(
+            name='Energy', slug='energy', rss_feed=url + 'news/',
+            scpd_rss_feed=url + 'broken/')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_refresh_feeds(self):
+        """
+        Entries are stored, and fetched again only once they changed
+        """
+        self.assertEqual(self.topic.get_rss_items(), [])
+        feeds, metadata = get_generations(FEEDS, METADATA)
+        self.assertEqual(refresh_feeds(), 1)
+        # Only the pages listing the entries are retired
+        self.assertNotEqual(get_generation(FEEDS), feeds)
+        self.assertEqual(get_generation(METADATA), metadata)
+        self.assertEqual(
+            [entry.title for entry in self.topic.get_rss_items()],
+            ['First News', 'Second News'])
+
+        # A broken feed is recorded, and doesn't break the others
+        broken = Feed.objects.get(url=self.topic.scpd_rss_feed)
+        self.assertIn('500', broken.error)
+        self.assertEqual(self.topic.get_partner_entries(), [])
+
+        # Unchanged feeds keep their entries
+        self.assertEqual(refresh_feeds([self.topic.rss_feed]), 0)
+        self.assertEqual(
+            self.server.requests[-1].get('if-none-match'), '"v1"')
+        self.assertEqual(len(self.topic.get_rss_items()), 2)
+
+        # Feeds no topic uses anymore are dropped
+        self.topic.scpd_rss_feed = None
+        self.topic.save()
+        refresh_feeds()
+        self.assertFalse(Feed.objects.filter(url__contains='broken').exists())
+
+    def test_store_errors(self):
+        """
+        Over long URLs are dropped, and a feed that can't be stored is
+        recorded, without keeping the others from being stored
+        """
+        entry = get_entry(Feed(url=self.topic.rss_feed), 0, {
+            'title': 'Long', 'link': 'http://example.com/' + 'a' * 1000})
+        self.assertEqual(entry.link, '')
+
+        other = SustainabilityTopic.objects.create(
+            name='Water', slug='water',
+            rss_feed=self.topic.rss_feed.replace('news', 'other'))
+        bulk_create = FeedEntry.objects.bulk_create
+
+        def fail_other(entries):
+            if entries[0].feed.url == other.rss_feed:
+                raise DataError('value too long')
+            return bulk_create(entries)
+
+        with patch.object(
+                FeedEntry.objects, 'bulk_create', side_effect=fail_other):
+            self.assertEqual(refresh_feeds(), 1)
+        self.assertEqual(len(self.topic.get_rss_items()), 2)
+        failed = Feed.objects.get(url=other.rss_feed)
+        self.assertIn('value too long', failed.error)
+        self.assertEqual(failed.etag, '')
@@ -1,9 +1,23 @@
+import json
+import os
+import shutil
+import tempfile
+
+import django_cache_url
 from haystack.inputs import Raw
-from haystack.query import SearchQuerySet
+from mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
 
 from ..apps.content.types.academic import AcademicProgram
 from .base import BaseSearchBackendTestCase
-from ..apps.content.models import Author
+from ..apps.content.indexing import queue_index_update, update_index
+from ..apps.content.models import Author, ContentType
+from ..apps.content.search import keyword_query
+from ..apps.browse.filter import OrderingFilter, SearchFilter
 
 TestContentType = AcademicProgram
 
@@ -19,4 +33,187 @@ class SearchBackendTestCase(BaseSearchBackendTestCase):
     # second, test if unpublished resource is not indexed (hint: rebuild_index)
 
     #third, test if published resource is indexed (hint: rebuild_index)
-        
+
+    def test_field_weights(self):
+        """
+        Each keyword may match any field; title matches rank first
+        """
+        published = TestContentType.STATUS_CHOICES.published
+        in_description = TestContentType.objects.create(
+            title='Campus Roofs', description='Panels for solar power',
+            status=published)
+        in_title = TestContentType.objects.create(
+            title='Solar Roofs', status=published)
+        self._rebuild_index()
+
+        hits = [int(pk) for pk in keyword_query('solar').values_list(
+            'ct_pk', flat=True)]
+        self.assertEqual(hits, [in_title.pk, in_description.pk])
+
+        hits = keyword_query('campus solar').values_list('ct_pk', flat=True)
+        self.assertEqual([int(pk) for pk in hits], [in_description.pk])
+
+    def test_phrases_and_exclusions(self):
+        """
+        Quoted keywords match as a phrase, and `-keyword` excludes hits
+        """
+        published = TestContentType.STATUS_CHOICES.published
+        phrase = TestContentType.objects.create(
+            title='Solar Energy Roofs', status=published)
+        TestContentType.objects.create(
+            title='Energy from Solar Roofs', status=published)
+        coal = TestContentType.objects.create(
+            title='Solar and Coal', status=published)
+        self._rebuild_index()
+
+        def hits(keywords):
+            return sorted(int(pk) for pk in keyword_query(
+                keywords).values_list('ct_pk', flat=True))
+
+        self.assertEqual(hits('"solar energy"'), [phrase.pk])
+        self.assertNotIn(coal.pk, hits('solar -coal'))
+        self.assertEqual(len(hits('solar -coal')), 2)
+        self.assertEqual(hits('-coal'), [])
+
+
+@override_settings(CACHES={
+    'default': django_cache_url.parse('locmem://hub_test')})
+class IncrementalIndexTestCase(BaseSearchBackendTestCase):
+    """
+    Tests around the queued, incremental search indexing.
+    """
+    def setUp(self):
+        caches['default'].clear()
+        self.resource = TestContentType.objects.create(
+            title='Incremental Resource',
+            status=TestContentType.STATUS_CHOICES.published)
+        self.item = (self.resource.pk, self.resource.content_type)
+
+    def test_update_index(self):
+        """
+        Published resources are indexed, others removed from the index
+        """
+        sqs = keyword_query('incremental')
+        self.assertEqual(sqs.count(), 0)
+
+        update_index([self.item])
+        self.assertEqual(sqs.all().count(), 1)
+
+        self.resource.status = TestContentType.STATUS_CHOICES.declined
+        self.resource.save()
+        update_index([self.item])
+        self.assertEqual(sqs.all().count(), 0)
+
+    @patch('hub.apps.content.tasks.update_search_index.apply_async')
+    def test_queue_is_debounced(self, apply_async):
+        """
+        A resource is only queued once until its update runs
+        """
+        queue_index_update([self.item])
+        queue_index_update([self.item])
+        self.assertEqual(apply_async.call_count, 1)
+
+        update_index([self.item])
+        queue_index_update([self.item])
+        self.assertEqual(apply_async.call_count, 2)
+
+
+class ReindexCommandTestCase(BaseSearchBackendTestCase):
+    """
+    Tests around the chunked, resumable `reindex` command.
+    """
+    def setUp(self):
+        self.resources = [
+            TestContentType.objects.create(
+                title='Reindexed Resource %d' % i,
+                status=TestContentType.STATUS_CHOICES.published)
+            for i in range(3)]
+        self.tmp_dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.tmp_dir, 'checkpoint.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def reindex(self, **kwargs):
+        call_command(
+            'reindex', 'academicprogram', workers=1, chunk_size=1,
+            checkpoint=self.checkpoint, **kwargs)
+
+    def test_reindex(self):
+        """
+        All published resources are indexed and the checkpoint is removed
+        """
+        self.reindex()
+        sqs = keyword_query('reindexed')
+        self.assertEqual(sqs.count(), 3)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    @patch('hub.apps.content.management.commands.reindex.index_shard')
+    def test_reindex_resumes_from_checkpoint(self, index_shard):
+        """
+        Ranges recorded in the checkpoint are skipped, unless restarting
+        """
+        index_shard.side_effect = lambda args: args[:3] + (1,)
+        first = self.resources[0].pk
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'academicprogram': [[first, first]]}, f)
+
+        self.reindex()
+        indexed = [call[0][0][1] for call in index_shard.call_args_list]
+        self.assertEqual(
+            sorted(indexed), [r.pk for r in self.resources[1:]])
+
+        index_shard.reset_mock()
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'academicprogram': [[first, first]]}, f)
+        self.reindex(restart=True)
+        self.assertEqual(index_shard.call_count, 3)
+
+
+@override_settings(KEYWORD_SEARCH_BACKEND='postgres')
+class PostgresSearchTestCase(TestCase):
+    """
+    Keyword search in Postgres, without a search index.
+    """
+    def setUp(self):
+        published = TestContentType.STATUS_CHOICES.published
+        self.in_title = TestContentType.objects.create(
+            title='Solar Roofs', status=published)
+        self.in_description = TestContentType.objects.create(
+            title='Campus Roofs', description='Panels for solar power',
+            status=published)
+        self.tagged = TestContentType.objects.create(
+            title='Campus Energy', status=published)
+        self.tagged.keywords.add('solar')
+        self.unpublished = TestContentType.objects.create(
+            title='Solar Farm')
+        update_index([
+            (ct.pk, ct.content_type) for ct in (
+                self.in_title, self.in_description, self.tagged,
+                self.unpublished)])
+
+    def test_search(self):
+        """
+        Matches are ranked by the weight of the matching text, in a single
+        query
+        """
+        qs = SearchFilter().filter(ContentType.objects.published(), 'solar')
+        qs = OrderingFilter().filter(qs, '')
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                [ct.pk for ct in qs],
+                [self.in_title.pk, self.tagged.pk, self.in_description.pk])
+
+        qs = SearchFilter().filter(
+            ContentType.objects.published(), 'solar campus')
+        self.assertEqual(
+            sorted(ct.pk for ct in qs),
+            [self.in_description.pk, self.tagged.pk])
+
+    def test_browse(self):
+        response = self.client.get(
+            reverse('browse:browse'), {'search': 'roofs'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(ct.pk for ct in response.context['object_list']),
+            [self.in_title.pk, self.in_description.pk])